@@ -37,6 +37,8 @@ class ATLASAppConf(AppConf):
     # Data model
     DATA_DIR = None
     INGESTION_CONCURRENCY = None
+    INGESTION_AUTOTUNE_PATH = None
+    TOKEN_BATCH_SIZE = 10000
     INGESTION_PIPELINE = [
         "scaife_viewer.atlas.importers.versions.import_versions",
     ]
@@ -45,6 +47,7 @@ class ATLASAppConf(AppConf):
 
     # Annotations
     EXPAND_IMAGE_ANNOTATION_REFS = True
+    GITHUB_CACHE_PATH = None
 
     # GraphQL settings
     IN_MEMORY_PASSAGE_CHUNK_MAX = 2500
@@ -55,14 +55,12 @@ def _prepare_attributions(path, counters):
 
         role = attribution["role"]
         # TODO: make use of counters[idx]
-        to_create.append(
-            AttributionRecord(
-                role=role,
-                person=pers_obj,
-                organization=org_obj,
-                data=attribution["data"],
-            )
+        record = AttributionRecord(
+            role=role, person=pers_obj, organization=org_obj, data=attribution["data"],
         )
+        # NOTE: bulk_create bypasses `AttributionRecord.save`
+        record.name = record.get_name_value()
+        to_create.append(record)
     return to_create
 
 
@@ -55,5 +55,4 @@ def import_audio_annotations(reset=False):
     created = len(AudioAnnotation.objects.bulk_create(to_create, batch_size=500))
     print(f"Created audio annotations [count={created}]")
 
-    for audio_annotation in AudioAnnotation.objects.all():
-        audio_annotation.resolve_references()
+    AudioAnnotation.bulk_resolve_references(AudioAnnotation.objects.all())
@@ -190,6 +190,9 @@ def _create_dictionaries(path):
             entry = DictionaryEntry(
                 headword=headword,
                 headword_normalized=headword_normalized,
+                headword_normalized_first_token=DictionaryEntry.get_first_token_value(
+                    headword_normalized
+                ),
                 idx=e_idx,
                 urn=e["urn"],
                 dictionary=dictionary,
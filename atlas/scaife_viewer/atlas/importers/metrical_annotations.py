@@ -178,5 +178,4 @@ def import_metrical_annotations(reset=False):
     created = len(MetricalAnnotation.objects.bulk_create(to_create, batch_size=500))
     print(f"Created metrical annotations [count={created}]")
 
-    for metrical_annotation in MetricalAnnotation.objects.all():
-        metrical_annotation.resolve_references()
+    MetricalAnnotation.bulk_resolve_references(MetricalAnnotation.objects.all())
@@ -1,11 +1,12 @@
 import csv
 import os
+from collections import defaultdict
 
 import logfmt
 
 from scaife_viewer.atlas.conf import settings
 
-from ..models import NamedEntity, Node
+from ..models import NamedEntity, Node, Token
 
 
 NAMED_ENTITIES_DATA_PATH = os.path.join(
@@ -55,15 +56,42 @@ def get_standoff_paths():
     ]
 
 
+def _get_token_lookup(text_part_urns, chunk_size=500):
+    """
+    Returns token pks keyed by text part URN and token position
+    """
+    text_part_urns = sorted(text_part_urns)
+    token_lookup = defaultdict(list)
+    for start in range(0, len(text_part_urns), chunk_size):
+        urns = text_part_urns[start : start + chunk_size]
+        text_part_ids = dict(Node.objects.filter(urn__in=urns).values_list("pk", "urn"))
+        missing = set(urns).difference(text_part_ids.values())
+        if missing:
+            raise Node.DoesNotExist(f"Could not find text parts: {sorted(missing)}")
+        tokens = Token.objects.filter(text_part_id__in=text_part_ids).values_list(
+            "text_part_id", "position", "pk"
+        )
+        for text_part_id, position, pk in tokens:
+            token_lookup[(text_part_ids[text_part_id], position)].append(pk)
+    return token_lookup
+
+
 def _apply_entities(path, lookup):
     with open(path, encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            named_entity = lookup[row["named_entity_urn"]]
-            text_part = Node.objects.get(urn=row["ref"])
-            position = int(row["token_position"])
-            tokens = text_part.tokens.filter(position__in=[position])
-            named_entity.tokens.add(*tokens)
+        rows = list(csv.DictReader(f))
+    # NOTE: Tokens are looked up in bulk and related via the through model,
+    # rather than querying for the text part and tokens of each row
+    token_lookup = _get_token_lookup({row["ref"] for row in rows})
+    through_model = NamedEntity.tokens.through
+    to_create = []
+    for row in rows:
+        named_entity = lookup[row["named_entity_urn"]]
+        key = (row["ref"], int(row["token_position"]))
+        to_create.extend(
+            through_model(namedentity_id=named_entity.pk, token_id=token_id)
+            for token_id in token_lookup.get(key, [])
+        )
+    through_model.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
 
 
 def apply_named_entities(reset=False):
@@ -1,8 +1,12 @@
 import json
 import os
+import threading
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from github import Github
+from github.NamedUser import NamedUser
+from github.Repository import Repository
 
 from scaife_viewer.atlas.conf import settings
 
@@ -15,6 +19,8 @@ from ..urn import URN
 ANNOTATIONS_DATA_PATH = os.path.join(
     settings.SV_ATLAS_DATA_DIR, "annotations", "repo-metadata"
 )
+# GitHub API calls are IO-bound; fetch repo metadata concurrently
+GITHUB_MAX_WORKERS = 16
 
 
 def get_paths():
@@ -29,29 +35,193 @@ def get_paths():
 
 def get_github_client():
     ACCESS_TOKEN = os.environ.get("GITHUB_ACCESS_TOKEN", "")
+    # NOTE: Size the connection pool for the metadata thread pool, so
+    # concurrent requests reuse keep-alive connections rather than
+    # opening (and TLS-negotiating) a new connection per request
+    # (requires PyGithub>=1.56)
+    kwargs = {"pool_size": GITHUB_MAX_WORKERS}
     if ACCESS_TOKEN:
-        client = Github(ACCESS_TOKEN)
+        client = Github(ACCESS_TOKEN, **kwargs)
     else:
-        client = Github()
+        client = Github(**kwargs)
     return client
 
 
-def get_extra_metadata(client, repo_name):
-    repo = client.get_repo(repo_name)
+def new_github_cache():
+    return {"repos": {}, "users": {}}
+
+
+def load_github_cache():
+    """
+    Returns the repo and user payloads (and their ETags) cached at
+    `SV_ATLAS_GITHUB_CACHE_PATH` by previous runs
+    """
+    cache = new_github_cache()
+    path = settings.SV_ATLAS_GITHUB_CACHE_PATH
+    if not path or not os.path.exists(path):
+        return cache
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except ValueError:
+        return cache
+    if isinstance(data, dict):
+        for key, entries in cache.items():
+            entries.update(data.get(key, {}))
+    return cache
+
+
+def save_github_cache(cache):
+    path = settings.SV_ATLAS_GITHUB_CACHE_PATH
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def get_object(client, klass, cached, fetch):
+    """
+    Returns `cached` revalidated with a conditional request, or the
+    result of `fetch` if there is no cached copy.
+
+    GitHub answers conditional requests for unchanged objects with a
+    `304 Not Modified` that doesn't count against the rate limit.
+    """
+    if not cached:
+        return fetch()
+    obj = client.create_from_raw_data(
+        klass, cached["raw_data"], {"etag": cached["etag"]}
+    )
+    # NOTE: On a `304 Not Modified`, `obj` is left as cached
+    obj.update()
+    return obj
+
+
+def get_repo(client, repo_name, cache, updates):
+    repo = get_object(
+        client,
+        Repository,
+        cache["repos"].get(repo_name),
+        lambda: client.get_repo(repo_name),
+    )
+    # NOTE: GitHub redirects requests for renamed repos; only cache
+    # payloads under the name they were returned for
+    if repo.full_name == repo_name:
+        updates["repos"][repo_name] = {"etag": repo.etag, "raw_data": repo.raw_data}
+    return repo
+
+
+def get_owner_name(client, repo, cache, updates, owner_names):
+    """
+    Returns the name of the owner of `repo`
+
+    Fetching the name requires a request per owner; `owner_names` caches
+    a future of the name by login, as most repos share a handful of
+    owners. Workers that reach an owner while it's being fetched wait on
+    its future, rather than fetching it again.
+    """
+    # NOTE: `login` is included in the repo payload
+    login = repo.owner.login
+    future = Future()
+    # NOTE: `setdefault` is atomic, so only one worker fetches each owner
+    owner_name = owner_names.setdefault(login, future)
+    if owner_name is future:
+        try:
+            owner = get_object(
+                client,
+                NamedUser,
+                cache["users"].get(login),
+                lambda: client.get_user(login),
+            )
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        updates["users"][login] = {"etag": owner.etag, "raw_data": owner.raw_data}
+        future.set_result(owner.name)
+    return owner_name.result()
+
+
+def get_extra_metadata(client, repo_name, cache=None, updates=None, owner_names=None):
+    """
+    Returns extra metadata for `repo_name`
+
+    Repos and users in `cache` are revalidated rather than refetched;
+    the payloads that were fetched or revalidated are added to `updates`.
+    Metadata is always derived from the current payloads, so a change to
+    a fork's source or to an owner's name is picked up even when the
+    repo itself is unchanged.
+    """
+    if cache is None:
+        cache = new_github_cache()
+    if updates is None:
+        updates = new_github_cache()
+    if owner_names is None:
+        owner_names = {}
+    repo = get_repo(client, repo_name, cache, updates)
     if repo.fork:
-        repo = repo.source
+        repo = get_repo(client, repo.source.full_name, cache, updates)
     return {
         "name": repo.name,
         "description": repo.description,
-        "owner": repo.owner.name,
+        "owner": get_owner_name(client, repo, cache, updates, owner_names),
         "github_url": repo.html_url,
         "homepage_url": repo.homepage,
     }
 
 
-def import_repo(data, namespaces, text_groups, works, client=None):
-    if client is None:
-        client = get_github_client()
+def get_extra_metadata_for_repos(repo_names):
+    """
+    Returns a mapping of repo name to extra metadata, fetching
+    from the GitHub API in a thread pool.
+
+    Payloads cached by previous runs are revalidated with conditional
+    requests.
+    """
+    repo_names = list(dict.fromkeys(repo_names))
+    if not repo_names:
+        return {}
+    cache = load_github_cache()
+    owner_names = {}
+    # NOTE: PyGithub clients aren't thread-safe (the requester tracks
+    # per-request state such as rate limits and the last response), so
+    # each worker thread gets its own client
+    local = threading.local()
+
+    def fetch(repo_name):
+        if not hasattr(local, "client"):
+            local.client = get_github_client()
+        # NOTE: Workers only read `cache`; their updates are merged in
+        # once all of the repos have been fetched
+        updates = new_github_cache()
+        metadata = get_extra_metadata(
+            local.client,
+            repo_name,
+            cache=cache,
+            updates=updates,
+            owner_names=owner_names,
+        )
+        return metadata, updates
+
+    max_workers = min(GITHUB_MAX_WORKERS, len(repo_names))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(fetch, repo_names))
+
+    extra_metadata = {}
+    for repo_name, (metadata, updates) in zip(repo_names, results):
+        extra_metadata[repo_name] = metadata
+        for key, entries in updates.items():
+            cache[key].update(entries)
+    save_github_cache(cache)
+    return extra_metadata
+
+
+def import_repo(data, namespaces, text_groups, works, client=None, metadata=None):
+    if metadata is None:
+        if client is None:
+            client = get_github_client()
+        metadata = get_extra_metadata(client, data["repo"])
 
     repo_name = data["repo"]
     urns = []
@@ -63,9 +233,7 @@ def import_repo(data, namespaces, text_groups, works, client=None):
         text_groups[urn.up_to(urn.TEXTGROUP)].add(repo_name)
         works[urn.up_to(urn.WORK)].add(repo_name)
 
-    repo_obj = Repo.objects.create(
-        name=repo_name, sha=data["sha"], metadata=get_extra_metadata(client, repo_name)
-    )
+    repo_obj = Repo.objects.create(name=repo_name, sha=data["sha"], metadata=metadata)
     repo_obj.urns.set(Node.objects.filter(urn__in=urns))
 
     print(repo_obj.name)
@@ -80,9 +248,13 @@ def import_repo_metadata(reset=False):
     namespaces = defaultdict(set)
     text_groups = defaultdict(set)
     works = defaultdict(set)
-    client = get_github_client()
 
+    repos = []
     for path in get_paths():
-        data = json.load(open(path))
-        for repo in data:
-            import_repo(repo, namespaces, text_groups, works, client=client)
+        with open(path) as f:
+            repos.extend(json.load(f))
+
+    extra_metadata = get_extra_metadata_for_repos([repo["repo"] for repo in repos])
+    for repo in repos:
+        metadata = extra_metadata[repo["repo"]]
+        import_repo(repo, namespaces, text_groups, works, metadata=metadata)
@@ -60,5 +60,4 @@ def import_text_annotations(reset=False):
     created = len(TextAnnotation.objects.bulk_create(to_create, batch_size=500))
     print(f"Created text annotations [count={created}]")
 
-    for text_annotation in TextAnnotation.objects.all():
-        text_annotation.resolve_references()
+    TextAnnotation.bulk_resolve_references(TextAnnotation.objects.all())
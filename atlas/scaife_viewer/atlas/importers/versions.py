@@ -154,6 +154,8 @@ class CTSImporter:
         # @@@ forked version of `Node._inc_path`
         # https://github.com/django-treebeard/django-treebeard/blob/master/treebeard/mp_tree.py#L1121
         child_node = Node(**node_data)
+        # NOTE: bulk_create bypasses `Node.save`
+        child_node.denormalize_metadata()
         child_node.depth = parent.depth + 1
 
         last_child = self.node_last_child_lookup.get(parent.urn)
@@ -1,4 +1,5 @@
 import unicodedata
+from functools import lru_cache
 
 import regex
 
@@ -22,6 +23,7 @@ def strip_marks(s):
     return nfkc(UNICODE_MARK_CATEGORY_REGEX.sub("", cps))
 
 
+@lru_cache(maxsize=4096)
 def normalize_string(s):
     """
     Strip marks and return the case-folded representation of string
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-14 09:12
+
+from django.db import migrations
+from scaife_viewer.atlas.operations import PostgresRunSQL
+
+
+# NOTE: `django_jsonfield_backport` stores JSON as `jsonb` on PostgreSQL;
+# `jsonb_path_ops` indexes are smaller than the default `jsonb_ops`
+# and support containment (`@>`) queries.
+JSON_GIN_INDEXES = [
+    ("textannotation", "data"),
+    ("metricalannotation", "data"),
+    ("imageannotation", "data"),
+    ("audioannotation", "data"),
+    ("metadata", "value_obj"),
+    ("namedentity", "data"),
+    ("dictionaryentry", "data"),
+]
+
+
+def gin_index_operation(model_name, field_name):
+    table = f"scaife_viewer_atlas_{model_name}"
+    index = f"atlas_{model_name}_{field_name}_gin"
+    return PostgresRunSQL(
+        sql=f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} USING gin ({field_name} jsonb_path_ops);",
+        reverse_sql=f"DROP INDEX CONCURRENTLY IF EXISTS {index};",
+    )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0008_metadata"),
+    ]
+
+    operations = [
+        gin_index_operation(model_name, field_name)
+        for model_name, field_name in JSON_GIN_INDEXES
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.28 on 2026-10-14 12:34
+
+from django.db import migrations, models
+from scaife_viewer.atlas.operations import PostgresRunSQL
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0009_postgres_json_gin_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="imageannotation",
+            name="image_identifier",
+            field=models.CharField(
+                blank=True, db_index=True, max_length=255, null=True
+            ),
+        ),
+        # NOTE: GIN indexes do not help `->>` extraction; these B-tree
+        # expression indexes do.
+        PostgresRunSQL(
+            sql="CREATE INDEX CONCURRENTLY IF NOT EXISTS atlas_metricalannotation_foot_code ON scaife_viewer_atlas_metricalannotation ((data->>'foot_code'));",
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS atlas_metricalannotation_foot_code;",
+        ),
+        PostgresRunSQL(
+            sql="CREATE INDEX CONCURRENTLY IF NOT EXISTS atlas_metricalannotation_line_num ON scaife_viewer_atlas_metricalannotation ((CAST(data->>'line_num' AS INTEGER)));",
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS atlas_metricalannotation_line_num;",
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.28 on 2026-10-14 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0010_metrical_and_image_annotation_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dictionaryentry",
+            index=models.Index(fields=["dictionary", "idx"], name="de_dict_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="textalignmentrecord",
+            index=models.Index(fields=["alignment", "idx"], name="tar_align_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="token",
+            index=models.Index(fields=["text_part", "position"], name="tok_tp_pos"),
+        ),
+    ]
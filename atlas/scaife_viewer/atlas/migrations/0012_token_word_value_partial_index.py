@@ -0,0 +1,21 @@
+# Generated by Django 2.2.28 on 2026-10-14 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0011_composite_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="token",
+            index=models.Index(
+                condition=models.Q(word_value__isnull=False),
+                fields=["word_value"],
+                name="tok_wv_partial",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-14 12:58
+
+from django.db import migrations
+from scaife_viewer.atlas.operations import PostgresRunSQL
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0012_token_word_value_partial_index"),
+    ]
+
+    operations = [
+        # NOTE: Outside of the C locale, PostgreSQL can only use an index
+        # for `LIKE 'prefix%'` (`path__startswith`, used by treebeard) with
+        # the `varchar_pattern_ops` operator class.
+        PostgresRunSQL(
+            sql="CREATE INDEX CONCURRENTLY IF NOT EXISTS atlas_node_path_pattern_ops ON scaife_viewer_atlas_node (path varchar_pattern_ops);",
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS atlas_node_path_pattern_ops;",
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 2.2.28 on 2026-10-14 13:10
+
+from django.db import migrations, models
+
+
+def populate_labels(apps, schema_editor):
+    Node = apps.get_model("scaife_viewer_atlas", "Node")
+    db_alias = schema_editor.connection.alias
+    to_update = []
+    for pk, urn, metadata in (
+        Node.objects.using(db_alias)
+        .values_list("pk", "urn", "metadata")
+        .iterator(chunk_size=2000)
+    ):
+        to_update.append(Node(pk=pk, label=(metadata or {}).get("label") or urn))
+        if len(to_update) >= 2000:
+            Node.objects.using(db_alias).bulk_update(to_update, ["label"])
+            to_update = []
+    Node.objects.using(db_alias).bulk_update(to_update, ["label"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0013_node_path_pattern_ops_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="node",
+            name="label",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="denormalized from metadata, falling back to the URN",
+                max_length=255,
+            ),
+        ),
+        migrations.RunPython(populate_labels, migrations.RunPython.noop),
+    ]
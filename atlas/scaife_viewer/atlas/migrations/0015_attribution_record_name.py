@@ -0,0 +1,40 @@
+# Generated by Django 2.2.28 on 2026-10-14 13:31
+
+from django.db import migrations, models
+
+
+def populate_names(apps, schema_editor):
+    AttributionRecord = apps.get_model("scaife_viewer_atlas", "AttributionRecord")
+    db_alias = schema_editor.connection.alias
+    to_update = []
+    for pk, person_name, organization_name in (
+        AttributionRecord.objects.using(db_alias)
+        .values_list("pk", "person__name", "organization__name")
+        .iterator(chunk_size=2000)
+    ):
+        name = ", ".join(filter(None, [person_name, organization_name]))
+        to_update.append(AttributionRecord(pk=pk, name=name))
+        if len(to_update) >= 2000:
+            AttributionRecord.objects.using(db_alias).bulk_update(to_update, ["name"])
+            to_update = []
+    AttributionRecord.objects.using(db_alias).bulk_update(to_update, ["name"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0014_node_label"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attributionrecord",
+            name="name",
+            field=models.CharField(
+                blank=True,
+                help_text="denormalized from the person / organization related to the record",
+                max_length=511,
+            ),
+        ),
+        migrations.RunPython(populate_names, migrations.RunPython.noop),
+    ]
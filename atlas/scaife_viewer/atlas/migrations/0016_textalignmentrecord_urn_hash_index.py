@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-14 13:44
+
+from django.db import migrations
+from scaife_viewer.atlas.operations import PostgresRunSQL
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0015_attribution_record_name"),
+    ]
+
+    operations = [
+        # NOTE: Record URNs are only looked up by equality; the unique
+        # B-tree index still enforces uniqueness, as PostgreSQL hash
+        # indexes cannot be unique.
+        PostgresRunSQL(
+            sql="CREATE INDEX CONCURRENTLY IF NOT EXISTS atlas_textalignmentrecord_urn_hash ON scaife_viewer_atlas_textalignmentrecord USING hash (urn);",
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS atlas_textalignmentrecord_urn_hash;",
+        ),
+    ]
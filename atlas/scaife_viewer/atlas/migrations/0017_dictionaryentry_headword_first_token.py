@@ -0,0 +1,54 @@
+# Generated by Django 2.2.28 on 2026-10-14 14:26
+
+import re
+
+from django.db import migrations, models
+
+
+HEADWORD_SEPARATOR_RE = re.compile(r"[,.;·\s]")
+
+
+def populate_first_tokens(apps, schema_editor):
+    DictionaryEntry = apps.get_model("scaife_viewer_atlas", "DictionaryEntry")
+    db_alias = schema_editor.connection.alias
+    to_update = []
+    for pk, headword_normalized in (
+        DictionaryEntry.objects.using(db_alias)
+        .exclude(headword_normalized=None)
+        .values_list("pk", "headword_normalized")
+        .iterator(chunk_size=2000)
+    ):
+        first_token = HEADWORD_SEPARATOR_RE.split(headword_normalized, maxsplit=1)[0]
+        to_update.append(
+            DictionaryEntry(pk=pk, headword_normalized_first_token=first_token)
+        )
+        if len(to_update) >= 2000:
+            DictionaryEntry.objects.using(db_alias).bulk_update(
+                to_update, ["headword_normalized_first_token"]
+            )
+            to_update = []
+    DictionaryEntry.objects.using(db_alias).bulk_update(
+        to_update, ["headword_normalized_first_token"]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0016_textalignmentrecord_urn_hash_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dictionaryentry",
+            name="headword_normalized_first_token",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="the normalized headword up to the first punctuation or whitespace",
+                max_length=255,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(populate_first_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.28 on 2026-10-14 12:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0017_dictionaryentry_headword_first_token"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="node",
+            index=models.Index(
+                condition=models.Q(depth=3), fields=["id"], name="node_textgroup_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="node",
+            index=models.Index(
+                condition=models.Q(depth=4), fields=["id"], name="node_work_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="node",
+            index=models.Index(
+                condition=models.Q(depth=5), fields=["id"], name="node_version_id"
+            ),
+        ),
+    ]
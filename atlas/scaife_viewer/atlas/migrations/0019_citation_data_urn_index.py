@@ -0,0 +1,22 @@
+# Generated by Django 2.2.28 on 2026-10-14 15:04
+
+from django.db import migrations
+from scaife_viewer.atlas.operations import PostgresRunSQL
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0018_node_workpart_partial_indexes"),
+    ]
+
+    operations = [
+        # NOTE: The `jsonb_path_ops` GIN indexes only support containment;
+        # `data ->> 'urn' IN (...)` needs a B-tree index on the expression.
+        PostgresRunSQL(
+            sql="CREATE INDEX CONCURRENTLY IF NOT EXISTS atlas_citation_data_urn ON scaife_viewer_atlas_citation ((data ->> 'urn'));",
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS atlas_citation_data_urn;",
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 2.2.28 on 2026-10-14 15:20
+
+from django.db import migrations, models
+
+
+DENORMALIZED_METADATA_FIELDS = {
+    "lang": "lang",
+    "description": "description",
+    "version_kind": "kind",
+}
+
+
+def populate_denormalized_metadata(apps, schema_editor):
+    Node = apps.get_model("scaife_viewer_atlas", "Node")
+    db_alias = schema_editor.connection.alias
+    field_names = list(DENORMALIZED_METADATA_FIELDS)
+    to_update = []
+    for pk, metadata in (
+        Node.objects.using(db_alias)
+        .filter(metadata__has_any_keys=list(DENORMALIZED_METADATA_FIELDS.values()))
+        .values_list("pk", "metadata")
+        .iterator(chunk_size=2000)
+    ):
+        to_update.append(
+            Node(
+                pk=pk,
+                **{
+                    field_name: metadata.get(key) or ""
+                    for field_name, key in DENORMALIZED_METADATA_FIELDS.items()
+                },
+            )
+        )
+        if len(to_update) >= 2000:
+            Node.objects.using(db_alias).bulk_update(to_update, field_names)
+            to_update = []
+    Node.objects.using(db_alias).bulk_update(to_update, field_names)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0019_citation_data_urn_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="node",
+            name="description",
+            field=models.TextField(blank=True, help_text="denormalized from metadata"),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="lang",
+            field=models.CharField(
+                blank=True, help_text="denormalized from metadata", max_length=255
+            ),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="version_kind",
+            field=models.CharField(
+                blank=True,
+                help_text="denormalized from metadata (e.g. edition or translation)",
+                max_length=255,
+            ),
+        ),
+        migrations.RunPython(populate_denormalized_metadata, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 2.2.28 on 2026-10-14 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0020_node_denormalized_metadata"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(model_name="token", name="tok_wv_partial",),
+        migrations.AddIndex(
+            model_name="token",
+            index=models.Index(
+                condition=models.Q(_negated=True, word_value=""),
+                fields=["word_value"],
+                name="tok_wv_partial",
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 2.2.28 on 2026-10-14 20:10
+
+from django.db import migrations, models
+
+
+DENORMALIZED_METADATA_FIELDS = {
+    "lang": "lang",
+    "description": "description",
+    "version_kind": "kind",
+}
+
+
+def restore_null_metadata(apps, schema_editor):
+    """
+    Replaces the empty strings the columns were backfilled with by the
+    metadata values, so missing / null values are null
+    """
+    Node = apps.get_model("scaife_viewer_atlas", "Node")
+    db_alias = schema_editor.connection.alias
+    for field_name, key in DENORMALIZED_METADATA_FIELDS.items():
+        to_update = []
+        for pk, metadata in (
+            Node.objects.using(db_alias)
+            .filter(**{field_name: ""})
+            .values_list("pk", "metadata")
+            .iterator(chunk_size=2000)
+        ):
+            to_update.append(Node(pk=pk, **{field_name: (metadata or {}).get(key)}))
+            if len(to_update) >= 2000:
+                Node.objects.using(db_alias).bulk_update(to_update, [field_name])
+                to_update = []
+        Node.objects.using(db_alias).bulk_update(to_update, [field_name])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0021_token_word_value_partial_index_nonempty"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="node",
+            name="description",
+            field=models.TextField(
+                blank=True, help_text="denormalized from metadata", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="node",
+            name="lang",
+            field=models.CharField(
+                blank=True,
+                help_text="denormalized from metadata",
+                max_length=255,
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="node",
+            name="version_kind",
+            field=models.CharField(
+                blank=True,
+                help_text="denormalized from metadata (e.g. edition or translation)",
+                max_length=255,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(restore_null_metadata, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,14 @@
+# Generated by Django 2.2.28 on 2026-10-14 20:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scaife_viewer_atlas", "0022_node_denormalized_metadata_nullable"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(model_name="token", name="tok_wv_partial",),
+    ]
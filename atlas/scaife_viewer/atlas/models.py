@@ -1,21 +1,131 @@
 import io
 import re
-from collections import defaultdict
+from collections import Counter
+from functools import lru_cache
 
-from django.core import serializers
-from django.db import models
+from django.db import connections, models, router
 from django.utils.functional import cached_property
 
 # @@@ optional for Django 3.1+
 from django_jsonfield_backport.models import JSONField
-from graphene_django.utils import camelize
 from sortedm2m.fields import SortedManyToManyField
-from treebeard.mp_tree import MP_Node
+from treebeard.mp_tree import MP_Node, MP_NodeManager, MP_NodeQuerySet
 
 from scaife_viewer.atlas import constants
 from scaife_viewer.atlas.conf import settings
 
 from .hooks import hookset
+from .utils import camelize
+
+
+_NON_WORD_RE = re.compile(r"[^\w]")
+_HEADWORD_SEPARATOR_RE = re.compile(r"[\u002C\u002E\u003B\u00B7\s]")
+_COPY_TEXT_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+)
+
+
+def _copy_text_value(value):
+    """
+    Formats `value` for PostgreSQL's `COPY ... FROM STDIN` text format
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(_COPY_TEXT_ESCAPES)
+
+
+@lru_cache(maxsize=4096)
+def _word_substrings(word):
+    """
+    Returns every substring of `word`, for tallying subreferences
+
+    Cached, as the most frequent words recur throughout a version.
+    """
+    length = len(word)
+    return tuple(word[i : j + 1] for i in range(length) for j in range(i, length))
+
+
+class ReferenceResolverMixin:
+    """
+    Resolves the CTS URNs in `data["references"]` to `text_parts`
+    """
+
+    unresolved_references_message = (
+        "Could not resolve all references, probably due to bad data in the CEX file"
+    )
+
+    def resolve_references(self):
+        if "references" not in self.data:
+            print(f'No references found [urn="{self.urn}"]')
+            return
+        desired_urns = set(self.data["references"])
+        reference_objs = list(Node.objects.filter(urn__in=desired_urns))
+        if len(reference_objs) != len(desired_urns):
+            delta_urns = desired_urns.difference(r.urn for r in reference_objs)
+            print(
+                f'{self.unresolved_references_message} [urn="{self.urn}" unresolved_urns="{",".join(delta_urns)}"]'
+            )
+        self.text_parts.set(reference_objs)
+
+    @classmethod
+    def bulk_resolve_references(cls, queryset, batch_size=5000):
+        """
+        Resolves references for every annotation in `queryset` using a
+        single lookup of all the referenced nodes and bulk inserts of
+        the `text_parts` through model, rather than queries per annotation.
+        """
+        field = cls._meta.get_field("text_parts")
+        through = field.remote_field.through
+        source_field_name = field.m2m_field_name()
+        target_field_name = field.m2m_reverse_field_name()
+        sort_field_name = through._sort_field_name
+
+        annotation_references = []
+        desired_urns = set()
+        # NOTE: Only the references are retained, so annotations are
+        # streamed rather than holding every `data` payload in memory
+        rows = queryset.values_list("pk", "urn", "data").iterator(chunk_size=2000)
+        for pk, urn, data in rows:
+            if "references" not in data:
+                print(f'No references found [urn="{urn}"]')
+                continue
+            references = set(data["references"])
+            annotation_references.append((pk, urn, references))
+            desired_urns.update(references)
+
+        node_lookup = Node.objects.only("pk", "urn", "path").in_bulk(
+            desired_urns, field_name="urn"
+        )
+
+        to_create = []
+        for pk, urn, references in annotation_references:
+            # NOTE: Matches the path ordering used by `text_parts.set`
+            reference_objs = sorted(
+                (node_lookup[r] for r in references if r in node_lookup),
+                key=lambda node: node.path,
+            )
+            if len(reference_objs) != len(references):
+                delta_urns = references.difference(node_lookup)
+                print(
+                    f'{cls.unresolved_references_message} [urn="{urn}" unresolved_urns="{",".join(delta_urns)}"]'
+                )
+            for sort_value, node in enumerate(reference_objs, 1):
+                to_create.append(
+                    through(
+                        **{
+                            f"{source_field_name}_id": pk,
+                            f"{target_field_name}_id": node.pk,
+                            sort_field_name: sort_value,
+                        }
+                    )
+                )
+
+        through.objects.filter(
+            **{f"{source_field_name}__in": queryset.values("pk")}
+        ).delete()
+        return len(through.objects.bulk_create(to_create, batch_size=batch_size))
 
 
 class TextAlignment(models.Model):
@@ -64,6 +174,7 @@ class TextAlignmentRecord(models.Model):
 
     class Meta:
         ordering = ["idx"]
+        indexes = [models.Index(fields=["alignment", "idx"], name="tar_align_idx")]
 
 
 class TextAlignmentRecordRelation(models.Model):
@@ -79,7 +190,7 @@ class TextAlignmentRecordRelation(models.Model):
     )
 
 
-class TextAnnotation(models.Model):
+class TextAnnotation(ReferenceResolverMixin, models.Model):
     kind = models.CharField(
         max_length=255,
         default=hookset.TEXT_ANNOTATION_DEFAULT_KIND,
@@ -94,23 +205,8 @@ class TextAnnotation(models.Model):
 
     urn = models.CharField(max_length=255, blank=True, null=True)
 
-    def resolve_references(self):
-        if "references" not in self.data:
-            print(f'No references found [urn="{self.urn}"]')
-            return
-        desired_urns = set(self.data["references"])
-        reference_objs = list(Node.objects.filter(urn__in=desired_urns))
-        resolved_urns = set([r.urn for r in reference_objs])
-        delta_urns = desired_urns.symmetric_difference(resolved_urns)
-
-        if delta_urns:
-            print(
-                f'Could not resolve all references, probably due to bad data in the CEX file [urn="{self.urn}" unresolved_urns="{",".join(delta_urns)}"]'
-            )
-        self.text_parts.set(reference_objs)
-
 
-class MetricalAnnotation(models.Model):
+class MetricalAnnotation(ReferenceResolverMixin, models.Model):
     # @@@ in the future, we may ingest any attributes into
     # `data` and query via JSON
     data = JSONField(default=dict, blank=True)
@@ -127,6 +223,8 @@ class MetricalAnnotation(models.Model):
 
     urn = models.CharField(max_length=255, blank=True, null=True)
 
+    unresolved_references_message = "Could not resolve all references"
+
     @property
     def metrical_pattern(self):
         """
@@ -146,27 +244,33 @@ class MetricalAnnotation(models.Model):
     def line_data(self):
         return self.data["line_data"]
 
-    def generate_html(self):
-        buffer = io.StringIO()
-        print(
-            f'        <div class="line {self.foot_code}" id="line-{self.line_num}" data-meter="{self.foot_code}">',
-            file=buffer,
-        )
-        print("          <div>", end="", file=buffer)
+    @cached_property
+    def _foot_slices(self):
+        """
+        (start, end) offsets into `line_data` for the syllables of each foot
+        """
+        slices = []
         index = 0
         for foot in self.foot_code:
-            if foot == "a":
-                syllables = self.line_data[index : index + 3]
-                index += 3
-            else:
-                syllables = self.line_data[index : index + 2]
-                index += 2
+            length = 3 if foot == "a" else 2
+            slices.append((index, index + length))
+            index += length
+        return slices
+
+    def generate_html(self):
+        line_data = self.line_data
+        parts = [
+            f'<div class="line {self.foot_code}" id="line-{self.line_num}" data-meter="{self.foot_code}">\n',
+            "          <div>",
+        ]
+        for start, end in self._foot_slices:
+            syllables = line_data[start:end]
             if syllables[0]["word_pos"] in [None, "r"]:
-                print("\n            ", end="", file=buffer)
-            print('<span class="foot">', end="", file=buffer)
+                parts.append("\n            ")
+            parts.append('<span class="foot">')
             for i, syllable in enumerate(syllables):
                 if i > 0 and syllable["word_pos"] in [None, "r"]:
-                    print("\n            ", end="", file=buffer)
+                    parts.append("\n            ")
                 syll_classes = ["syll"]
                 if syllable["length"] == "long":
                     syll_classes.append("long")
@@ -175,55 +279,31 @@ class MetricalAnnotation(models.Model):
                 if syllable["word_pos"] is not None:
                     syll_classes.append(syllable["word_pos"])
                 syll_class_string = " ".join(syll_classes)
-                print(
-                    f'<span class="{syll_class_string}">{syllable["text"]}</span>',
-                    end="",
-                    file=buffer,
+                parts.append(
+                    f'<span class="{syll_class_string}">{syllable["text"]}</span>'
                 )
-            print("</span>", end="", file=buffer)
-        print("\n          </div>", file=buffer)
-        print("        </div>", file=buffer)
-        buffer.seek(0)
-        return buffer.read().strip()
+            parts.append("</span>")
+        parts.append("\n          </div>\n        </div>")
+        return "".join(parts)
 
     def generate_short_form(self):
         """
         |μῆ:νιν :ἄ|ει:δε :θε|ὰ /Πη|λη:ϊ:ά|δεω :Ἀ:χι|λῆ:ος
         """
-        index = 0
-        form = ""
-        for foot in self.foot_code:
-            if foot == "a":
-                syllables = self.line_data[index : index + 3]
-                index += 3
-            else:
-                syllables = self.line_data[index : index + 2]
-                index += 2
-            form += "|"
+        line_data = self.line_data
+        parts = []
+        for start, end in self._foot_slices:
+            syllables = line_data[start:end]
+            parts.append("|")
             for i, syllable in enumerate(syllables):
                 if i > 0 and syllable["word_pos"] in [None, "r"]:
-                    form += " "
+                    parts.append(" ")
                 if syllable["caesura"]:
-                    form += "/"
+                    parts.append("/")
                 elif i > 0:
-                    form += ":"
-                form += syllable["text"]
-        return form
-
-    def resolve_references(self):
-        if "references" not in self.data:
-            print(f'No references found [urn="{self.urn}"]')
-            return
-        desired_urns = set(self.data["references"])
-        reference_objs = list(Node.objects.filter(urn__in=desired_urns))
-        resolved_urns = set([r.urn for r in reference_objs])
-        delta_urns = desired_urns.symmetric_difference(resolved_urns)
-
-        if delta_urns:
-            print(
-                f'Could not resolve all references [urn="{self.urn}" unresolved_urns="{",".join(delta_urns)}"]'
-            )
-        self.text_parts.set(reference_objs)
+                    parts.append(":")
+                parts.append(syllable["text"])
+        return "".join(parts)
 
 
 IMAGE_ANNOTATION_KIND_CANVAS = "canvas"
@@ -238,7 +318,9 @@ class ImageAnnotation(models.Model):
     )
     data = JSONField(default=dict, blank=True)
     # @@@ denormed from data
-    image_identifier = models.CharField(max_length=255, blank=True, null=True)
+    image_identifier = models.CharField(
+        max_length=255, blank=True, null=True, db_index=True
+    )
     canvas_identifier = models.CharField(max_length=255, blank=True, null=True)
     idx = models.IntegerField(help_text="0-based index")
 
@@ -270,7 +352,7 @@ class ImageROI(models.Model):
     )
 
 
-class AudioAnnotation(models.Model):
+class AudioAnnotation(ReferenceResolverMixin, models.Model):
     data = JSONField(default=dict, blank=True)
     asset_url = models.URLField(max_length=200)
     idx = models.IntegerField(help_text="0-based index")
@@ -281,20 +363,30 @@ class AudioAnnotation(models.Model):
 
     urn = models.CharField(max_length=255, blank=True, null=True)
 
-    def resolve_references(self):
-        if "references" not in self.data:
-            print(f'No references found [urn="{self.urn}"]')
-            return
-        desired_urns = set(self.data["references"])
-        reference_objs = list(Node.objects.filter(urn__in=desired_urns))
-        resolved_urns = set([r.urn for r in reference_objs])
-        delta_urns = desired_urns.symmetric_difference(resolved_urns)
 
-        if delta_urns:
-            print(
-                f'Could not resolve all references, probably due to bad data in the CEX file [urn="{self.urn}" unresolved_urns="{",".join(delta_urns)}"]'
-            )
-        self.text_parts.set(reference_objs)
+class NodeQuerySet(MP_NodeQuerySet):
+    def text_groups(self):
+        return self.filter(depth=constants.CTS_URN_DEPTHS["textgroup"])
+
+    def works(self):
+        return self.filter(depth=constants.CTS_URN_DEPTHS["work"])
+
+    def versions(self):
+        return self.filter(depth=constants.CTS_URN_DEPTHS["version"])
+
+
+class NodeManager(MP_NodeManager):
+    def get_queryset(self):
+        return NodeQuerySet(self.model).order_by("path")
+
+    def text_groups(self):
+        return self.get_queryset().text_groups()
+
+    def works(self):
+        return self.get_queryset().works()
+
+    def versions(self):
+        return self.get_queryset().versions()
 
 
 # TODO: Review https://docs.djangoproject.com/en/3.0/topics/db/multi-db/
@@ -309,17 +401,75 @@ class Node(MP_Node):
     ref = models.CharField(max_length=255, blank=True, null=True)
     rank = models.IntegerField(blank=True, null=True)
     text_content = models.TextField(blank=True, null=True)
-    # @@@ we may want to furthe de-norm label from metadata
     metadata = JSONField(default=dict, blank=True, null=True)
+    label = models.CharField(
+        max_length=255,
+        blank=True,
+        db_index=True,
+        help_text="denormalized from metadata, falling back to the URN",
+    )
+    lang = models.CharField(
+        max_length=255, blank=True, null=True, help_text="denormalized from metadata"
+    )
+    description = models.TextField(
+        blank=True, null=True, help_text="denormalized from metadata"
+    )
+    version_kind = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="denormalized from metadata (e.g. edition or translation)",
+    )
 
     alphabet = settings.SV_ATLAS_NODE_ALPHABET
 
+    # NOTE: Maps denormalized fields to their `metadata` keys; these are
+    # used by GraphQL resolvers, so list queries can defer `metadata`.
+    denormalized_metadata_fields = {
+        "lang": "lang",
+        "description": "description",
+        "version_kind": "kind",
+    }
+
+    objects = NodeManager()
+
+    class Meta:
+        # NOTE: Partial indexes for the workpart listings, which are
+        # paginated by pk
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="node_textgroup_id",
+                condition=models.Q(depth=constants.CTS_URN_DEPTHS["textgroup"]),
+            ),
+            models.Index(
+                fields=["id"],
+                name="node_work_id",
+                condition=models.Q(depth=constants.CTS_URN_DEPTHS["work"]),
+            ),
+            models.Index(
+                fields=["id"],
+                name="node_version_id",
+                condition=models.Q(depth=constants.CTS_URN_DEPTHS["version"]),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.kind}: {self.urn}"
 
-    @property
-    def label(self):
-        return self.metadata.get("label", self.urn)
+    @staticmethod
+    def get_label_value(urn, metadata):
+        return (metadata or {}).get("label") or urn
+
+    def denormalize_metadata(self):
+        self.label = self.get_label_value(self.urn, self.metadata)
+        metadata = self.metadata or {}
+        for field_name, key in self.denormalized_metadata_fields.items():
+            setattr(self, field_name, metadata.get(key))
+
+    def save(self, *args, **kwargs):
+        self.denormalize_metadata()
+        super().save(*args, **kwargs)
 
     @property
     def lsb(self):
@@ -330,7 +480,7 @@ class Node(MP_Node):
         """
         return self.lowest_citabale_part
 
-    @property
+    @cached_property
     def lowest_citable_part(self):
         """
         Returns the lowest part of the URN's citation
@@ -339,7 +489,7 @@ class Node(MP_Node):
         """
         if not self.rank:
             return None
-        return self.ref.split(".").pop()
+        return self.ref.rpartition(".")[2]
 
     @classmethod
     def dump_tree(cls, root=None, up_to=None, to_camel=True):
@@ -352,34 +502,41 @@ class Node(MP_Node):
         if up_to and up_to not in constants.CTS_URN_NODES:
             raise ValueError(f"Invalid CTS node identifier for: {up_to}")
 
-        # NOTE: This filters the queryset using path__startswith,
+        # NOTE: This filters the queryset using a path lookup,
         # because the default `get_tree(parent=root)` uses `self.is_leaf
         # and the current bulk ingestion into ATLAS does not populate
         # `numchild`.
         qs = cls._get_serializable_model().get_tree()
         if root:
             qs = qs.filter(
-                path__startswith=root.path,
+                cls._get_descendants_path_filter(root.path, include_self=True),
                 # depth__gte=parent.depth
             ).order_by("path")
         if up_to:
             depth = constants.CTS_URN_DEPTHS[up_to]
             qs = qs.exclude(depth__gt=depth)
 
+        # NOTE: Reading values directly avoids instantiating models and
+        # running the serialization framework for each node.
+        field_names = [
+            f.name
+            for f in cls._meta.concrete_fields
+            if f.name not in {"id", "depth", "path", "numchild", "label"}
+            and f.name not in cls.denormalized_metadata_fields
+        ]
+        # NOTE: Field values are scalars (other than `metadata`, which is
+        # camelized separately), so keys are only camelized once per dump.
+        camel_names = camelize({name: None for name in field_names}).keys()
+        field_name_map = dict(zip(field_names, camel_names))
         tree, index = [], {}
-        for pyobj in serializers.serialize("python", qs):
-            fields = pyobj["fields"]
-            path = fields["path"]
+        for fields in qs.values("path", *field_names).iterator(chunk_size=2000):
+            path = fields.pop("path")
             depth = int(len(path) / cls.steplen)
-            del fields["depth"]
-            del fields["path"]
-            del fields["numchild"]
 
-            metadata = fields["metadata"]
             if to_camel:
-                fields = camelize(fields)
-                metadata = camelize(metadata)
-            fields.update({"metadata": metadata})
+                metadata = camelize(fields["metadata"])
+                fields = {field_name_map[k]: v for k, v in fields.items()}
+                fields["metadata"] = metadata
 
             newobj = {"data": fields}
 
@@ -412,13 +569,38 @@ class Node(MP_Node):
         # does not populate numchild.
         # TODO: populate numchild and remove override
         parent = self
-        return (
-            self.__class__.objects.filter(
-                path__startswith=parent.path, depth__gte=parent.depth
-            )
-            .order_by("path")
-            .exclude(pk=parent.pk)
-        )
+        return self.__class__.objects.filter(
+            self._get_descendants_path_filter(parent.path, using=self._state.db),
+            depth__gte=parent.depth,
+        ).order_by("path")
+
+    @classmethod
+    def _get_descendants_path_filter(cls, path, include_self=False, using=None):
+        """
+        Returns a lookup matching the descendants of `path`
+
+        Paths use a mixed-case alphabet. PostgreSQL's `LIKE` is
+        case-sensitive, but its collation may not sort in byte order, so
+        descendants are matched with `path__startswith` (served by the
+        `varchar_pattern_ops` index). SQLite's `LIKE` ignores case, but its
+        default `BINARY` collation compares bytes, so a path range is used
+        instead.
+        """
+        connection = connections[using or router.db_for_read(cls)]
+        if connection.vendor != "sqlite":
+            lookup = models.Q(path__startswith=path)
+            if not include_self:
+                lookup &= ~models.Q(path=path)
+            return lookup
+
+        lookup = models.Q(path__gte=path) if include_self else models.Q(path__gt=path)
+        # the smallest path in `alphabet` that sorts after every path
+        # prefixed by `path`
+        upper = path.rstrip(cls.alphabet[-1])
+        if upper:
+            upper = upper[:-1] + cls.alphabet[cls.alphabet.index(upper[-1]) + 1]
+            lookup &= models.Q(path__lt=upper)
+        return lookup
 
     def get_children(self):
         # NOTE: This overrides `get_children` to avoid checking
@@ -477,12 +659,39 @@ class Token(models.Model):
         help_text="a human-readable reference to the token via a virtualized exemplar",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["text_part", "position"], name="tok_tp_pos"),
+        ]
+
     @staticmethod
     def get_word_value(value):
-        return re.sub(r"[^\w]", "", value)
+        return _NON_WORD_RE.sub("", value)
+
+    @classmethod
+    def get_init_template(cls):
+        """
+        Returns the default values of the concrete fields in the order
+        `Model.__init__` accepts them positionally, and the index of each
+        field's attname within that list
+
+        NOTE: Token fields only have constant defaults, so the values can
+        be shared between instances.
+        """
+        fields = cls._meta.concrete_fields
+        return (
+            [field.get_default() for field in fields],
+            {field.attname: i for i, field in enumerate(fields)},
+        )
 
     @classmethod
     def tokenize(cls, text_part_node, counters):
+        """
+        Returns unsaved tokens for `text_part_node`
+
+        Only `pk`, `ref` and `text_content` are read, so `text_part_node`
+        may also be a row from `values_list(..., named=True)`.
+        """
         # @@@ compare with passage-based tokenization on
         # scaife-viewer/scaife-viewer.  See discussion on
         # https://github.com/scaife-viewer/scaife-viewer/issues/162
@@ -490,36 +699,110 @@ class Token(models.Model):
         # For this implementation, we always calculate the index
         # within the text part, _not_ the passage. Also see
         # http://www.homermultitext.org/hmt-doc/cite/cts-subreferences.html
-        idx = defaultdict(int)
+        idx = Counter()
         pieces = text_part_node.text_content.split()
+        # NOTE: Bind the loop invariants locally; this runs once per token
+        # during ingestion.
+        get_word_value = cls.get_word_value
+        ref = text_part_node.ref
+        token_idx = counters["token_idx"]
+        # NOTE: Tokens are instantiated positionally from a template row;
+        # `Model.__init__` handles keyword arguments field by field, which
+        # otherwise dominates tokenization.
+        defaults, field_index = cls.get_init_template()
+        defaults[field_index["text_part_id"]] = text_part_node.pk
+        value_i = field_index["value"]
+        word_value_i = field_index["word_value"]
+        position_i = field_index["position"]
+        ve_ref_i = field_index["ve_ref"]
+        idx_i = field_index["idx"]
+        subref_value_i = field_index["subref_value"]
         to_create = []
-        for pos, piece in enumerate(pieces):
+        for position, piece in enumerate(pieces, 1):
             # @@@ the word value will discard punctuation or
             # whitespace, which means we only support "true"
             # subrefs for word tokens
-            w = cls.get_word_value(piece)
-            wl = len(w)
-            for wk in (w[i : j + 1] for i in range(wl) for j in range(i, wl)):
-                idx[wk] += 1
-            subref_idx = idx[w]
-            subref_value = f"{w}[{subref_idx}]"
-
-            position = pos + 1
-            to_create.append(
-                cls(
-                    text_part=text_part_node,
-                    value=piece,
-                    word_value=w,
-                    position=position,
-                    ve_ref=f"{text_part_node.ref}.t{position}",
-                    idx=counters["token_idx"],
-                    subref_value=subref_value,
-                )
-            )
-            counters["token_idx"] += 1
+            w = get_word_value(piece)
+            # NOTE: Subreferences count occurrences of `w` as a substring
+            # of the preceding words, so every substring is tallied;
+            # `Counter.update` does the counting in C.
+            idx.update(_word_substrings(w))
+
+            row = defaults.copy()
+            row[value_i] = piece
+            row[word_value_i] = w
+            row[position_i] = position
+            row[ve_ref_i] = f"{ref}.t{position}"
+            row[idx_i] = token_idx
+            row[subref_value_i] = f"{w}[{idx[w]}]"
+            to_create.append(cls(*row))
+            token_idx += 1
+        counters["token_idx"] = token_idx
         return to_create
 
+    @classmethod
+    def bulk_tokenize(cls, text_part_nodes, counters, batch_size=1000):
+        """
+        Tokenizes each text part and inserts the resulting tokens via
+        `bulk_create`, flushing every `batch_size` tokens.
+
+        `ve_ref` and `subref_value` are computed in Python, so no queries
+        are required per token.
+        """
+        created = 0
+        to_create = []
+        for text_part_node in text_part_nodes:
+            to_create.extend(cls.tokenize(text_part_node, counters))
+            if len(to_create) >= batch_size:
+                created += cls.bulk_insert(to_create, batch_size)
+                to_create = []
+        if to_create:
+            created += cls.bulk_insert(to_create, batch_size)
+        return created
+
+    @classmethod
+    def bulk_insert(cls, tokens, batch_size=1000):
+        """
+        Inserts `tokens` via `COPY` on PostgreSQL and `bulk_create`
+        otherwise, returning the number of tokens inserted.
+
+        NOTE: Tokens inserted via `COPY` aren't assigned a pk.
+        """
+        connection = connections[router.db_for_write(cls)]
+        if connection.vendor != "postgresql":
+            return len(cls.objects.bulk_create(tokens, batch_size))
+
+        fields = [f for f in cls._meta.concrete_fields if not f.primary_key]
+        buf = cls.build_copy_buffer(tokens, fields, connection)
+        quote_name = connection.ops.quote_name
+        table = quote_name(cls._meta.db_table)
+        columns = ", ".join(quote_name(f.column) for f in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", buf)
+        return len(tokens)
+
+    @staticmethod
+    def build_copy_buffer(tokens, fields, connection):
+        """
+        Returns a buffer of `tokens` in `COPY ... FROM STDIN` text format,
+        with a column for each of `fields`
+        """
+        buf = io.StringIO()
+        for token in tokens:
+            values = (
+                f.get_db_prep_save(getattr(token, f.attname), connection)
+                for f in fields
+            )
+            buf.write("\t".join(map(_copy_text_value, values)))
+            buf.write("\n")
+        buf.seek(0)
+        return buf
+
     def __str__(self):
+        # NOTE: Avoids fetching the text part for tokens that were
+        # queried without it
+        if "text_part" not in self._state.fields_cache:
+            return f"<Token {self.pk}>"
         return f"{self.text_part.urn} :: {self.value}"
 
 
@@ -614,8 +897,13 @@ class AttributionRecord(models.Model):
         "scaife_viewer_atlas.Node", related_name="attribution_records"
     )
 
-    @cached_property
-    def name(self):
+    name = models.CharField(
+        max_length=511,
+        blank=True,
+        help_text="denormalized from the person / organization related to the record",
+    )
+
+    def get_name_value(self):
         """
         Provides a shortcut for the person / organization related to
         the record
@@ -627,10 +915,21 @@ class AttributionRecord(models.Model):
             parts.append(self.organization.name)
         return ", ".join(parts)
 
+    def save(self, *args, **kwargs):
+        self.name = self.get_name_value()
+        super().save(*args, **kwargs)
+
 
 class DictionaryEntry(models.Model):
     headword = models.CharField(max_length=255)
     headword_normalized = models.CharField(max_length=255, blank=True, null=True)
+    headword_normalized_first_token = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        db_index=True,
+        help_text="the normalized headword up to the first punctuation or whitespace",
+    )
     data = JSONField(default=dict, blank=True)
 
     idx = models.IntegerField(help_text="0-based index")
@@ -644,6 +943,22 @@ class DictionaryEntry(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = [models.Index(fields=["dictionary", "idx"], name="de_dict_idx")]
+
+    @staticmethod
+    def get_first_token_value(value):
+        return _HEADWORD_SEPARATOR_RE.split(value, maxsplit=1)[0]
+
+    def save(self, *args, **kwargs):
+        if self.headword_normalized is None:
+            self.headword_normalized_first_token = None
+        else:
+            self.headword_normalized_first_token = self.get_first_token_value(
+                self.headword_normalized
+            )
+        super().save(*args, **kwargs)
+
 
 class Sense(MP_Node):
     label = models.CharField(blank=True, null=True, max_length=255)
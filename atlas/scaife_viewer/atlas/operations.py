@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class PostgresRunSQL(migrations.RunSQL):
+    """
+    Runs SQL only when migrating a PostgreSQL database.
+
+    ATLAS databases are usually SQLite; this allows migrations to add
+    PostgreSQL-specific indexes without breaking other backends.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return "Raw SQL operation (PostgreSQL only)"
@@ -1,3 +1,5 @@
+from django.utils.functional import cached_property
+
 from .models import Node as TextPart
 from .utils import extract_version_urn_and_ref, get_chunker
 
@@ -153,7 +155,7 @@ class PassageSiblingMetadata(SelectedTextPartsMixin):
     def boundary_end(self):
         return self.passage.end.idx
 
-    @property
+    @cached_property
     def all(self):
         text_part_siblings = self.passage.start.get_siblings()
         data = []
@@ -194,7 +196,7 @@ class PassageOverviewMetadata(SelectedTextPartsMixin):
     def __init__(self, passage):
         self.passage = passage
 
-    @property
+    @cached_property
     def all(self):
         data = []
         for tp in self.passage.version.get_children().values(
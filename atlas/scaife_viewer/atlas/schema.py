@@ -1,13 +1,18 @@
 import os
+from collections import defaultdict
+from functools import lru_cache
+from types import MappingProxyType
 
-from django.db.models import Q
+from django.db.models import CharField, Exists, OuterRef, Q
 
 import django_filters
+from django_jsonfield_backport.models import KeyTextTransform
 from graphene import Boolean, Connection, Field, ObjectType, String, relay
 from graphene.types import generic
 from graphene_django import DjangoObjectType
 from graphene_django.filter import DjangoFilterConnectionField
-from graphene_django.utils import camelize
+from promise import Promise
+from promise.dataloader import DataLoader
 
 from . import constants
 
@@ -24,6 +29,7 @@ from .models import (
     Dictionary,
     DictionaryEntry,
     ImageAnnotation,
+    ImageROI,
     Metadata,
     MetricalAnnotation,
     NamedEntity,
@@ -42,8 +48,12 @@ from .passage import (
     PassageSiblingMetadata,
 )
 from .utils import (
+    camelize,
     extract_version_urn_and_ref,
     filter_via_ref_predicate,
+    get_selected_model_fields,
+    get_selected_node_fields,
+    get_selected_related_fields,
     get_textparts_from_passage_reference,
 )
 
@@ -149,6 +159,110 @@ class PassageSiblingsNode(ObjectType):
         return obj.next
 
 
+def _cached(info, key, factory):
+    """
+    Memoizes `factory()` under `key` on `info.context` for the request
+    """
+    cache = getattr(info.context, "_resolver_cache", None)
+    if cache is None:
+        cache = info.context._resolver_cache = {}
+    if key not in cache:
+        cache[key] = factory()
+    return cache[key]
+
+
+class LabelLoader(DataLoader):
+    """
+    Loads node labels by path
+
+    Labels requested while resolving a connection are batched into a
+    single query; the loader is cached on `info.context`, so each path
+    is queried at most once per request.
+    """
+
+    def batch_load_fn(self, paths):
+        queryset = TextPart.objects.filter(path__in=paths).order_by()
+        labels = dict(queryset.values_list("path", "label"))
+        return Promise.resolve([labels.get(path) for path in paths])
+
+
+def select_selected_related(queryset, info):
+    """
+    Joins the forward relations selected by the connection being
+    resolved, rather than fetching them once per edge
+    """
+    related_fields = get_selected_related_fields(info, queryset.model)
+    if related_fields:
+        queryset = queryset.select_related(*related_fields)
+    return queryset
+
+
+class NodeLoader(DataLoader):
+    """
+    Loads instances of a relay node type by primary key
+
+    Nodes fetched by id within a request (e.g. several aliased
+    `token(id: ...)` fields) are batched into a single query per type.
+    """
+
+    def __init__(self, node_type, info, **kwargs):
+        super().__init__(**kwargs)
+        self.node_type = node_type
+        self.info = info
+
+    def batch_load_fn(self, ids):
+        model = self.node_type._meta.model
+        queryset = self.node_type.get_queryset(model.objects, self.info)
+        nodes = {str(pk): obj for pk, obj in queryset.in_bulk(ids).items()}
+        return Promise.resolve([nodes.get(str(pk)) for pk in ids])
+
+
+class CTSRelationsLoader(DataLoader):
+    """
+    Loads the first `limit` CTS relations of metadata records by pk
+
+    Relations requested while resolving a connection are batched into
+    two queries: one for the (narrow) rows of the through table, and one
+    for the first `limit` nodes of each record, restricted to
+    `model_fields` when given.
+    """
+
+    def __init__(self, limit, model_fields=None, **kwargs):
+        super().__init__(**kwargs)
+        self.limit = limit
+        self.model_fields = model_fields
+
+    def batch_load_fn(self, metadata_pks):
+        through = Metadata.cts_relations.through
+        node_pks = defaultdict(list)
+        rows = (
+            through.objects.filter(metadata__in=metadata_pks)
+            .order_by("metadata", "sort_value")
+            .values_list("metadata", "node")
+        )
+        for metadata_pk, node_pk in rows:
+            if len(node_pks[metadata_pk]) < self.limit:
+                node_pks[metadata_pk].append(node_pk)
+
+        queryset = TextPart.objects.all()
+        if self.model_fields is not None:
+            queryset = queryset.only(*self.model_fields)
+        nodes = queryset.in_bulk([pk for pks in node_pks.values() for pk in pks])
+        return Promise.resolve(
+            [
+                [nodes[pk] for pk in node_pks[metadata_pk]]
+                for metadata_pk in metadata_pks
+            ]
+        )
+
+
+class NodeLoaderMixin:
+    @classmethod
+    def get_node(cls, info, id):
+        loader = _cached(info, ("node_loader", cls), lambda: NodeLoader(cls, info))
+        return loader.load(id)
+
+
 class PassageMetadataNode(ObjectType):
     human_reference = String()
     ancestors = generic.GenericScalar()
@@ -166,30 +280,57 @@ class PassageMetadataNode(ObjectType):
     def resolve_previous_passage(self, info, *args, **kwargs):
         passage = info.context.passage
         if passage.previous_objects:
-            return self.generate_passage_urn(passage.version, passage.previous_objects)
+            return _cached(
+                info,
+                ("previous_passage", passage.reference),
+                lambda: self.generate_passage_urn(
+                    passage.version, passage.previous_objects
+                ),
+            )
 
     def resolve_next_passage(self, info, *args, **kwargs):
         passage = info.context.passage
         if passage.next_objects:
-            return self.generate_passage_urn(passage.version, passage.next_objects)
+            return _cached(
+                info,
+                ("next_passage", passage.reference),
+                lambda: self.generate_passage_urn(
+                    passage.version, passage.next_objects
+                ),
+            )
 
     def resolve_overview(self, info, *args, **kwargs):
-        passage = info.context.passage
         # TODO: Review overview / ancestors / siblings implementation
         passage = info.context.passage
-        return PassageOverviewMetadata(passage)
+        return _cached(
+            info,
+            ("overview", passage.reference),
+            lambda: PassageOverviewMetadata(passage),
+        )
 
     def resolve_ancestors(self, info, *args, **kwargs):
         passage = info.context.passage
-        return self.get_ancestor_metadata(passage.version, passage.start)
+        return _cached(
+            info,
+            ("ancestors", passage.reference),
+            lambda: self.get_ancestor_metadata(passage.version, passage.start),
+        )
 
     def resolve_siblings(self, info, *args, **kwargs):
         passage = info.context.passage
-        return PassageSiblingMetadata(passage)
+        return _cached(
+            info,
+            ("siblings", passage.reference),
+            lambda: PassageSiblingMetadata(passage),
+        )
 
     def resolve_children(self, info, *args, **kwargs):
         passage = info.context.passage
-        return self.get_children_metadata(passage.start)
+        return _cached(
+            info,
+            ("children", passage.reference),
+            lambda: self.get_children_metadata(passage.start),
+        )
 
     def resolve_human_reference(self, info, *args, **kwargs):
         passage = info.context.passage
@@ -216,7 +357,7 @@ class TextPartFilterSet(django_filters.FilterSet):
 
     def reference_filter(self, queryset, name, value):
         version_urn, ref = extract_version_urn_and_ref(value)
-        start, end = ref.split("-")
+        start, _, end = ref.partition("-")
         refs = [start]
         if end:
             refs.append(end)
@@ -250,7 +391,15 @@ def initialize_passage(gql_context, reference):
     """
     from scaife_viewer.atlas.backports.scaife_viewer.cts import passage_heal
 
-    passage, healed = passage_heal(reference)
+    # NOTE: Several filtersets may be passed the same reference
+    # within a single request; the healed passage is only cached for the
+    # request, so it isn't stale after the corpus is re-ingested.
+    heal_cache = getattr(gql_context, "_passage_heal_cache", None)
+    if heal_cache is None:
+        heal_cache = gql_context._passage_heal_cache = {}
+    if reference not in heal_cache:
+        heal_cache[reference] = passage_heal(reference)
+    passage, healed = heal_cache[reference]
     gql_context.passage = passage
     if healed:
         gql_context.healed_passage_reference = passage.reference
@@ -260,8 +409,69 @@ def initialize_passage(gql_context, reference):
 class TextPartsReferenceFilterMixin:
     def get_lowest_textparts_queryset(self, value):
         value = initialize_passage(self.request, value)
-        version = self.request.passage.version
-        return get_textparts_from_passage_reference(value, version=version)
+        textparts_cache = getattr(self.request, "_textparts_cache", None)
+        if textparts_cache is None:
+            textparts_cache = self.request._textparts_cache = {}
+        if value not in textparts_cache:
+            version = self.request.passage.version
+            textparts_cache[value] = get_textparts_from_passage_reference(
+                value, version=version
+            )
+        return textparts_cache[value]
+
+    def get_lowest_textparts_urns(self, value):
+        """
+        Returns the URNs of the lowest text parts as a list, which is
+        retrieved once per request and passed as parameters, rather
+        than as a subquery, to lookups against `data ->> 'urn'`.
+        """
+        textparts_queryset = self.get_lowest_textparts_queryset(value)
+        urns_cache = getattr(self.request, "_textparts_urns_cache", None)
+        if urns_cache is None:
+            urns_cache = self.request._textparts_urns_cache = {}
+        reference = self.request.passage.reference
+        if reference not in urns_cache:
+            urns_cache[reference] = list(
+                textparts_queryset.values_list("urn", flat=True)
+            )
+        return urns_cache[reference]
+
+    @staticmethod
+    def filter_via_citation_urns(queryset, field_name, urns):
+        """
+        Filters `queryset` to rows where the `urn` key of the JSON field
+        `field_name` is one of `urns`.
+        """
+        # NOTE: `data__urn__in` would JSON-encode each of `urns`; comparing
+        # against `->>` as text also matches the expression index on
+        # `Citation.data` under PostgreSQL.
+        return queryset.annotate(
+            citation_urn=KeyTextTransform("urn", field_name, output_field=CharField())
+        ).filter(citation_urn__in=urns)
+
+    @staticmethod
+    def filter_via_exists(queryset, subquery):
+        """
+        Filters `queryset` to rows for which `subquery` (correlated via
+        `OuterRef`) has results; unlike joining and calling `distinct()`,
+        this requires no de-duplication of the joined rows.
+        """
+        # NOTE: Django 2.2 can't filter on an `Exists` expression directly
+        return queryset.annotate(has_reference=Exists(subquery.values("pk"))).filter(
+            has_reference=True
+        )
+
+    @staticmethod
+    def filter_via_matches(queryset, matches):
+        """
+        Filters `queryset` against the pks of `matches` as a subquery
+
+        Unlike joining against `matches` directly, the subquery doesn't
+        duplicate rows, so graphene's paginated / counted queries don't
+        need a `DISTINCT`; unlike a list of pks, it isn't bound by the
+        database's limit on query parameters.
+        """
+        return queryset.filter(pk__in=matches.order_by().values("pk"))
 
 
 class PassageTextPartFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet):
@@ -275,7 +485,19 @@ class PassageTextPartFilterSet(TextPartsReferenceFilterMixin, django_filters.Fil
         return self.get_lowest_textparts_queryset(value)
 
 
-class AbstractTextPartNode(DjangoObjectType):
+TEXT_PART_NODE_META = MappingProxyType(
+    {
+        "model": TextPart,
+        "interfaces": (relay.Node,),
+        "filterset_class": TextPartFilterSet,
+        # NOTE: Denormalized from metadata for the resolvers, rather than
+        # exposed as fields of their own
+        "exclude": tuple(TextPart.denormalized_metadata_fields),
+    }
+)
+
+
+class AbstractTextPartNode(NodeLoaderMixin, DjangoObjectType):
     label = String()
     name = String()
     metadata = generic.GenericScalar()
@@ -285,15 +507,20 @@ class AbstractTextPartNode(DjangoObjectType):
 
     @classmethod
     def __init_subclass_with_meta__(cls, **meta_options):
-        meta_options.update(
-            {
-                "model": TextPart,
-                "interfaces": (relay.Node,),
-                "filterset_class": TextPartFilterSet,
-            }
-        )
+        meta_options.update(TEXT_PART_NODE_META)
         super().__init_subclass_with_meta__(**meta_options)
 
+    @staticmethod
+    def defer_unselected_metadata(queryset, info):
+        """
+        Defers `metadata` when it isn't selected by the connection being
+        resolved; other fields read from metadata are denormalized.
+        """
+        node_fields = get_selected_node_fields(info)
+        if node_fields is not None and "metadata" not in node_fields:
+            return queryset.defer("metadata")
+        return queryset
+
     def resolve_metadata(obj, *args, **kwargs):
         return camelize(obj.metadata)
 
@@ -303,14 +530,8 @@ class TextGroupNode(AbstractTextPartNode):
 
     @classmethod
     def get_queryset(cls, queryset, info):
-        return queryset.filter(depth=constants.CTS_URN_DEPTHS["textgroup"]).order_by(
-            "pk"
-        )
-
-    # TODO: extract to AbstractTextPartNode
-    def resolve_label(obj, *args, **kwargs):
-        # @@@ consider a direct field or faster mapping
-        return obj.metadata["label"]
+        queryset = cls.defer_unselected_metadata(queryset, info)
+        return queryset.text_groups().order_by("pk")
 
     def resolve_metadata(obj, *args, **kwargs):
         metadata = obj.metadata
@@ -323,19 +544,15 @@ class WorkNode(AbstractTextPartNode):
 
     @classmethod
     def get_queryset(cls, queryset, info):
-        return queryset.filter(depth=constants.CTS_URN_DEPTHS["work"]).order_by("pk")
-
-    # TODO: extract to AbstractTextPartNode
-    def resolve_label(obj, *args, **kwargs):
-        # @@@ consider a direct field or faster mapping
-        return obj.metadata["label"]
+        queryset = cls.defer_unselected_metadata(queryset, info)
+        return queryset.works().order_by("pk")
 
     def resolve_metadata(obj, *args, **kwargs):
         metadata = obj.metadata
         return camelize(metadata)
 
 
-class RepoNode(DjangoObjectType):
+class RepoNode(NodeLoaderMixin, DjangoObjectType):
     versions = LimitedConnectionField(lambda: VersionNode)
     metadata = generic.GenericScalar()
 
@@ -365,7 +582,8 @@ class VersionNode(AbstractTextPartNode):
     def get_queryset(cls, queryset, info):
         # TODO: set a default somewhere
         # return queryset.filter(kind="version").order_by("urn")
-        return queryset.filter(depth=constants.CTS_URN_DEPTHS["version"]).order_by("pk")
+        queryset = cls.defer_unselected_metadata(queryset, info)
+        return queryset.versions().order_by("pk")
 
     # TODO: Determine how tightly coupled these fields
     # should be to metadata (including ["key"] vs .get("key"))
@@ -374,39 +592,31 @@ class VersionNode(AbstractTextPartNode):
         return hookset.can_access_urn(request, obj.urn)
 
     def resolve_human_lang(obj, *args, **kwargs):
-        lang = obj.metadata["lang"]
-        return hookset.get_human_lang(lang)
-
-    def resolve_lang(obj, *args, **kwargs):
-        return obj.metadata["lang"]
-
-    def resolve_description(obj, *args, **kwargs):
-        # @@@ consider a direct field or faster mapping
-        return obj.metadata["description"]
+        return hookset.get_human_lang(obj.lang)
 
     def resolve_kind(obj, *args, **kwargs):
-        # @@@ consider a direct field or faster mapping
-        return obj.metadata["kind"]
-
-    # TODO: extract to AbstractTextPartNode
-    def resolve_label(obj, *args, **kwargs):
-        # @@@ consider a direct field or faster mapping
-        return obj.metadata["label"]
+        return obj.version_kind
 
     # TODO: convert metadata to proper fields
-    def resolve_metadata(obj, *args, **kwargs):
+    def resolve_metadata(obj, info, *args, **kwargs):
         metadata = obj.metadata
-        work = obj.get_parent()
-        text_group = work.get_parent()
-        metadata.update(
-            {
-                "work_label": work.label,
-                "text_group_label": text_group.label,
-                "lang": metadata["lang"],
-                "human_lang": hookset.get_human_lang(metadata["lang"]),
-            }
-        )
-        return camelize(metadata)
+        work_path = TextPart._get_basepath(obj.path, obj.depth - 1)
+        text_group_path = TextPart._get_basepath(obj.path, obj.depth - 2)
+
+        def update_metadata(labels):
+            work_label, text_group_label = labels
+            metadata.update(
+                {
+                    "work_label": work_label,
+                    "text_group_label": text_group_label,
+                    "lang": metadata["lang"],
+                    "human_lang": hookset.get_human_lang(metadata["lang"]),
+                }
+            )
+            return camelize(metadata)
+
+        loader = _cached(info, "label_loader", LabelLoader)
+        return loader.load_many([work_path, text_group_path]).then(update_metadata)
 
 
 class TextPartNode(AbstractTextPartNode):
@@ -421,6 +631,7 @@ class PassageTextPartNode(DjangoObjectType):
         interfaces = (relay.Node,)
         connection_class = PassageTextPartConnection
         filterset_class = PassageTextPartFilterSet
+        exclude = tuple(TextPart.denormalized_metadata_fields)
 
 
 class TreeNode(ObjectType):
@@ -441,12 +652,13 @@ class TextAlignmentFilterSet(TextPartsReferenceFilterMixin, django_filters.Filte
         textparts_queryset = self.get_lowest_textparts_queryset(value)
         # TODO: we may wish to further denorm relations to textparts
         # OR query based on the version, rather than the passage reference
-        return queryset.filter(
-            records__relations__tokens__text_part__in=textparts_queryset
-        ).distinct()
+        relations = TextAlignmentRecordRelation.objects.filter(
+            record__alignment=OuterRef("pk"), tokens__text_part__in=textparts_queryset,
+        )
+        return self.filter_via_exists(queryset, relations)
 
 
-class TextAlignmentNode(DjangoObjectType):
+class TextAlignmentNode(NodeLoaderMixin, DjangoObjectType):
     metadata = generic.GenericScalar()
 
     class Meta:
@@ -475,33 +687,31 @@ class TextAlignmentRecordFilterSet(
         textparts_queryset = self.get_lowest_textparts_queryset(value)
         # TODO: Refactor as a manager method
         # TODO: Evaluate performance / consider a TextPart denorm on relations
-        return queryset.filter(
-            relations__tokens__text_part__in=textparts_queryset
-        ).distinct()
+        relations = TextAlignmentRecordRelation.objects.filter(
+            record=OuterRef("pk"), tokens__text_part__in=textparts_queryset
+        )
+        return self.filter_via_exists(queryset, relations)
 
 
 # TODO: Where do these nested non-Django objects live in the project?
 # Saelor favors <app>/types and <app>/schema; may revisit as we hit 1k LOC here
 class TextAlignmentMetadata(dict):
-    def get_passage_reference(self, version_urn, text_parts_list):
-        refs = [text_parts_list[0].ref]
-        last_ref = text_parts_list[-1].ref
+    def get_passage_reference(self, version_urn, first_ref, last_ref):
+        refs = [first_ref]
         if last_ref not in refs:
             refs.append(last_ref)
         refpart = "-".join(refs)
         return f"{version_urn}{refpart}"
 
-    def generate_passage_reference(self, version_urn, tokens_qs):
-        tokens_list = list(
-            tokens_qs.filter(text_part__urn__startswith=version_urn).order_by("idx")
-        )
-        text_parts_list = list(
-            TextPart.objects.filter(tokens__in=tokens_list).distinct()
-        )
+    def generate_passage_reference(self, version_urn, tokens):
+        # NOTE: Token idx follows text part order, so only the first and
+        # last tokens (and their text part refs) are required
+        start_idx, first_ref = min(tokens)
+        end_idx, last_ref = max(tokens)
         return {
-            "reference": self.get_passage_reference(version_urn, text_parts_list),
-            "start_idx": tokens_list[0].idx,
-            "end_idx": tokens_list[-1].idx,
+            "reference": self.get_passage_reference(version_urn, first_ref, last_ref),
+            "start_idx": start_idx,
+            "end_idx": end_idx,
         }
 
     @property
@@ -511,9 +721,14 @@ class TextAlignmentMetadata(dict):
         if not alignment_records:
             return references
 
-        tokens_qs = Token.objects.filter(
+        # NOTE: Tokens for every version are retrieved in a single query
+        # and bucketed by version URN
+        version_tokens = defaultdict(list)
+        for idx, text_part_urn, text_part_ref in Token.objects.filter(
             alignment_record_relations__record__in=alignment_records
-        )
+        ).values_list("idx", "text_part__urn", "text_part__ref"):
+            token_version_urn, _ = extract_version_urn_and_ref(text_part_urn)
+            version_tokens[token_version_urn].append((idx, text_part_ref))
 
         # TODO: What does the order look like when we "start"
         # from the "middle" of a three-way alignment?
@@ -521,11 +736,16 @@ class TextAlignmentMetadata(dict):
         # and then loop through the remaining, which could do weird
         # things for the order of "versions"
         version_urn, ref = extract_version_urn_and_ref(self["passage"].reference)
-        references.append(self.generate_passage_reference(version_urn, tokens_qs))
+        version_urns = [version_urn]
 
         alignment = TextAlignment.objects.get(urn=self["alignment_urn"])
-        for version in alignment.versions.exclude(urn=version_urn):
-            references.append(self.generate_passage_reference(version.urn, tokens_qs))
+        version_urns.extend(
+            alignment.versions.exclude(urn=version_urn).values_list("urn", flat=True)
+        )
+        for urn in version_urns:
+            tokens = version_tokens.get(urn)
+            if tokens:
+                references.append(self.generate_passage_reference(urn, tokens))
         return references
 
 
@@ -550,10 +770,24 @@ class TextAlignmentConnection(Connection):
         if aligmment_urn:
             return aligmment_urn
 
-        for selection in info.operation.selection_set.selections:
-            for argument in selection.arguments:
-                if argument.name.value == NAME_ALIGNMENT_URN:
-                    return argument.value.value
+        # NOTE: AST nodes use __slots__, so the result of walking the
+        # operation is cached on the context instead
+        cache = getattr(info.context, "_alignment_urn_cache", None)
+        if cache is None:
+            cache = info.context._alignment_urn_cache = {}
+        key = id(info.operation)
+        if key not in cache:
+            cache[key] = next(
+                (
+                    argument.value.value
+                    for selection in info.operation.selection_set.selections
+                    for argument in selection.arguments
+                    if argument.name.value == NAME_ALIGNMENT_URN
+                ),
+                None,
+            )
+        if cache[key] is not None:
+            return cache[key]
 
         raise Exception(
             f"{NAME_ALIGNMENT_URN} argument is required to retrieve metadata"
@@ -570,20 +804,28 @@ class TextAlignmentConnection(Connection):
         )
 
 
-class TextAlignmentRecordNode(DjangoObjectType):
+class TextAlignmentRecordNode(NodeLoaderMixin, DjangoObjectType):
     class Meta:
         model = TextAlignmentRecord
         interfaces = (relay.Node,)
         connection_class = TextAlignmentConnection
         filterset_class = TextAlignmentRecordFilterSet
 
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        return select_selected_related(queryset, info)
+
 
-class TextAlignmentRecordRelationNode(DjangoObjectType):
+class TextAlignmentRecordRelationNode(NodeLoaderMixin, DjangoObjectType):
     class Meta:
         model = TextAlignmentRecordRelation
         interfaces = (relay.Node,)
         filter_fields = ["tokens__text_part__urn"]
 
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        return select_selected_related(queryset, info)
+
 
 class TextAnnotationFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet):
     reference = django_filters.CharFilter(method="reference_filter")
@@ -594,10 +836,22 @@ class TextAnnotationFilterSet(TextPartsReferenceFilterMixin, django_filters.Filt
 
     def reference_filter(self, queryset, name, value):
         textparts_queryset = self.get_lowest_textparts_queryset(value)
-        return queryset.filter(text_parts__in=textparts_queryset).distinct()
+        through_objs = TextAnnotation.text_parts.through.objects.filter(
+            textannotation=OuterRef("pk"), node__in=textparts_queryset
+        )
+        return self.filter_via_exists(queryset, through_objs)
 
 
-class AbstractTextAnnotationNode(DjangoObjectType):
+TEXT_ANNOTATION_NODE_META = MappingProxyType(
+    {
+        "model": TextAnnotation,
+        "interfaces": (relay.Node,),
+        "filterset_class": TextAnnotationFilterSet,
+    }
+)
+
+
+class AbstractTextAnnotationNode(NodeLoaderMixin, DjangoObjectType):
     data = generic.GenericScalar()
 
     class Meta:
@@ -605,13 +859,7 @@ class AbstractTextAnnotationNode(DjangoObjectType):
 
     @classmethod
     def __init_subclass_with_meta__(cls, **meta_options):
-        meta_options.update(
-            {
-                "model": TextAnnotation,
-                "interfaces": (relay.Node,),
-                "filterset_class": TextAnnotationFilterSet,
-            }
-        )
+        meta_options.update(TEXT_ANNOTATION_NODE_META)
         super().__init_subclass_with_meta__(**meta_options)
 
     def resolve_data(obj, *args, **kwargs):
@@ -632,7 +880,7 @@ class SyntaxTreeNode(AbstractTextAnnotationNode):
         return queryset.filter(kind=constants.TEXT_ANNOTATION_KIND_SYNTAX_TREE)
 
 
-class MetricalAnnotationNode(DjangoObjectType):
+class MetricalAnnotationNode(NodeLoaderMixin, DjangoObjectType):
     data = generic.GenericScalar()
     metrical_pattern = String()
 
@@ -655,10 +903,13 @@ class ImageAnnotationFilterSet(TextPartsReferenceFilterMixin, django_filters.Fil
 
         # Since individual lines are at the roi level, we query there.
         textparts_queryset = self.get_lowest_textparts_queryset(value)
-        return queryset.filter(roi__text_parts__in=textparts_queryset).distinct()
+        rois = ImageROI.objects.filter(
+            image_annotation=OuterRef("pk"), text_parts__in=textparts_queryset
+        )
+        return self.filter_via_exists(queryset, rois)
 
 
-class ImageAnnotationNode(DjangoObjectType):
+class ImageAnnotationNode(NodeLoaderMixin, DjangoObjectType):
     text_parts = LimitedConnectionField(lambda: TextPartNode)
     data = generic.GenericScalar()
 
@@ -668,7 +919,7 @@ class ImageAnnotationNode(DjangoObjectType):
         filterset_class = ImageAnnotationFilterSet
 
 
-class AudioAnnotationNode(DjangoObjectType):
+class AudioAnnotationNode(NodeLoaderMixin, DjangoObjectType):
     data = generic.GenericScalar()
 
     class Meta:
@@ -683,12 +934,19 @@ class TokenFilterSet(django_filters.FilterSet):
         fields = {"text_part__urn": ["exact", "startswith"]}
 
 
-class TokenNode(DjangoObjectType):
+class TokenNode(NodeLoaderMixin, DjangoObjectType):
     class Meta:
         model = Token
         interfaces = (relay.Node,)
         filterset_class = TokenFilterSet
 
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        model_fields = get_selected_model_fields(info, Token)
+        if model_fields is not None:
+            queryset = queryset.only(*model_fields)
+        return select_selected_related(queryset, info)
+
 
 class NamedEntityFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet):
     reference = django_filters.CharFilter(method="reference_filter")
@@ -699,10 +957,13 @@ class NamedEntityFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterS
 
     def reference_filter(self, queryset, name, value):
         textparts_queryset = self.get_lowest_textparts_queryset(value)
-        return queryset.filter(tokens__text_part__in=textparts_queryset).distinct()
+        through_objs = NamedEntity.tokens.through.objects.filter(
+            namedentity=OuterRef("pk"), token__text_part__in=textparts_queryset
+        )
+        return self.filter_via_exists(queryset, through_objs)
 
 
-class NamedEntityNode(DjangoObjectType):
+class NamedEntityNode(NodeLoaderMixin, DjangoObjectType):
     data = generic.GenericScalar()
 
     class Meta:
@@ -723,7 +984,7 @@ class AttributionRecordFilterSet(django_filters.FilterSet):
         return queryset.filter(data__references__icontains=value)
 
 
-class AttributionRecordNode(DjangoObjectType):
+class AttributionRecordNode(NodeLoaderMixin, DjangoObjectType):
     name = String()
 
     class Meta:
@@ -733,10 +994,14 @@ class AttributionRecordNode(DjangoObjectType):
 
     @classmethod
     def get_queryset(cls, queryset, info):
-        return queryset.select_related("person", "organization")
+        model_fields = get_selected_model_fields(info, AttributionRecord)
+        if model_fields is None:
+            return queryset.select_related("person", "organization")
+        related = [name for name in ["person", "organization"] if name in model_fields]
+        return queryset.select_related(*related).only(*model_fields)
 
 
-class DictionaryNode(DjangoObjectType):
+class DictionaryNode(NodeLoaderMixin, DjangoObjectType):
     # FIXME: Implement access checking for all queries
 
     class Meta:
@@ -745,6 +1010,11 @@ class DictionaryNode(DjangoObjectType):
         filter_fields = ["urn"]
 
 
+@lru_cache(maxsize=1024)
+def build_lemma_pattern(value_normalized):
+    return rf"^({value_normalized})$|^({value_normalized})[\u002C\u002E\u003B\u00B7\s]"
+
+
 class DictionaryEntryFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet):
     reference = django_filters.CharFilter(method="reference_filter")
     lemma = django_filters.CharFilter(method="lemma_filter")
@@ -769,29 +1039,25 @@ class DictionaryEntryFilterSet(TextPartsReferenceFilterMixin, django_filters.Fil
                 senses__citations__text_parts__in=textparts_queryset
             )
         else:
-            matches = queryset.filter(
-                senses__citations__data__urn__in=textparts_queryset.values_list("urn")
+            urns = self.get_lowest_textparts_urns(value)
+            matches = self.filter_via_citation_urns(
+                queryset, "senses__citations__data", urns
             )
-        return queryset.filter(pk__in=matches)
+        return self.filter_via_matches(queryset, matches)
 
     def lemma_filter(self, queryset, name, value):
         value_normalized = normalize_string(value)
-        lemma_pattern = (
-            rf"^({value_normalized})$|^({value_normalized})[\u002C\u002E\u003B\u00B7\s]"
-        )
+        # NOTE: Matching the headword exactly or up to punctuation /
+        # whitespace is equivalent to matching its (indexed) first token
+        if DictionaryEntry.get_first_token_value(value_normalized) == value_normalized:
+            return queryset.filter(headword_normalized_first_token=value_normalized)
+        # NOTE: The pattern is passed as a query parameter, so the SQL is
+        # the same across lemmas
+        lemma_pattern = build_lemma_pattern(value_normalized)
         return queryset.filter(headword_normalized__regex=lemma_pattern)
 
 
-def _crush_sense(tree):
-    # TODO: Prefer GraphQL Ids
-    urn = tree["data"].pop("urn")
-    tree["id"] = urn
-    tree.pop("data")
-    for child in tree.get("children", []):
-        _crush_sense(child)
-
-
-class DictionaryEntryNode(DjangoObjectType):
+class DictionaryEntryNode(NodeLoaderMixin, DjangoObjectType):
     data = generic.GenericScalar()
     sense_tree = generic.GenericScalar(
         description="A nested structure returning the URN(s) of senses attached to this entry"
@@ -799,17 +1065,32 @@ class DictionaryEntryNode(DjangoObjectType):
 
     def resolve_sense_tree(obj, info, **kwargs):
         # TODO: Proper GraphQL field for crushed tree nodes
-        data = []
-        for sense in obj.senses.filter(depth=1):
-            tree = sense.dump_bulk(parent=sense)[0]
-            _crush_sense(tree)
-            data.append(tree)
+        # NOTE: Builds the tree from a single query of the entry's senses,
+        # rather than dumping the tree for each top-level sense
+        data, lookup = [], {}
+        steplen = Sense.steplen
+        for path, urn in obj.senses.order_by("path").values_list("path", "urn"):
+            # TODO: Prefer GraphQL Ids
+            node = {"id": urn}
+            if len(path) == steplen:
+                data.append(node)
+            else:
+                parent = lookup.get(path[:-steplen])
+                if parent is None:
+                    continue
+                parent.setdefault("children", []).append(node)
+            lookup[path] = node
         return data
 
     class Meta:
         model = DictionaryEntry
         interfaces = (relay.Node,)
         filterset_class = DictionaryEntryFilterSet
+        exclude = ["headword_normalized_first_token"]
+
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        return select_selected_related(queryset, info)
 
 
 class SenseFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet):
@@ -834,13 +1115,13 @@ class SenseFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet):
         if RESOLVE_CITATIONS_VIA_TEXT_PARTS:
             matches = queryset.filter(citations__text_parts__in=textparts_queryset)
         else:
-            matches = queryset.filter(
-                citations__data__urn__in=textparts_queryset.values_list("urn")
+            matches = self.filter_via_citation_urns(
+                queryset, "citations__data", self.get_lowest_textparts_urns(value)
             )
-        return queryset.filter(pk__in=matches)
+        return self.filter_via_matches(queryset, matches)
 
 
-class SenseNode(DjangoObjectType):
+class SenseNode(NodeLoaderMixin, DjangoObjectType):
     # TODO: Implement subsenses or descendants either as a top-level
     # field or combining path, depth and URN filters
 
@@ -849,6 +1130,10 @@ class SenseNode(DjangoObjectType):
         interfaces = (relay.Node,)
         filterset_class = SenseFilterSet
 
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        return select_selected_related(queryset, info)
+
 
 class CitationFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet):
     reference = django_filters.CharFilter(method="reference_filter")
@@ -865,15 +1150,15 @@ class CitationFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet)
         # TODO: Determine why graphene bloats the "simple" query;
         # if we just filter the queryset against ids, we're much better off
         if RESOLVE_CITATIONS_VIA_TEXT_PARTS:
-            matches = queryset.filter(text_parts__in=textparts_queryset).distinct()
+            matches = queryset.filter(text_parts__in=textparts_queryset)
         else:
-            matches = queryset.filter(
-                data__urn__in=textparts_queryset.values_list("urn")
+            matches = self.filter_via_citation_urns(
+                queryset, "data", self.get_lowest_textparts_urns(value)
             )
-        return queryset.filter(pk__in=matches)
+        return self.filter_via_matches(queryset, matches)
 
 
-class CitationNode(DjangoObjectType):
+class CitationNode(NodeLoaderMixin, DjangoObjectType):
     text_parts = LimitedConnectionField(TextPartNode)
     data = generic.GenericScalar()
 
@@ -896,6 +1181,10 @@ class CitationNode(DjangoObjectType):
         interfaces = (relay.Node,)
         filterset_class = CitationFilterSet
 
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        return select_selected_related(queryset, info)
+
 
 class MetadataFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet):
     reference = django_filters.CharFilter(method="reference_filter")
@@ -926,8 +1215,8 @@ class MetadataFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet)
         workparts_queryset = self.get_workparts_queryset(self.request.passage.version)
 
         union_qs = textparts_queryset | workparts_queryset
-        matches = queryset.filter(cts_relations__in=union_qs).distinct()
-        return queryset.filter(pk__in=matches)
+        matches = queryset.filter(cts_relations__in=union_qs)
+        return self.filter_via_matches(queryset, matches)
 
     def visibility_filter(self, queryset, name, value):
         return queryset.filter(visibility=value)
@@ -940,7 +1229,7 @@ class MetadataFilterSet(TextPartsReferenceFilterMixin, django_filters.FilterSet)
         return queryset.filter(visibility=visibility_lookup[value])
 
 
-class MetadataNode(DjangoObjectType):
+class MetadataNode(NodeLoaderMixin, DjangoObjectType):
     # NOTE: We are going to specify `PassageTextPartNode` so we can use the reference
     # filter, but it may not be the ideal field long term (mainly, if we want to link to
     # more generic CITE URNs, not just work-part or textpart URNs)
@@ -954,6 +1243,24 @@ class MetadataNode(DjangoObjectType):
         # TODO: Resolve with a future update to graphene-django
         convert_choices_to_enum = []
 
+    def resolve_cts_relations(obj, info, **kwargs):
+        # NOTE: The connection field re-queries (and filters) querysets, so
+        # the first page of relations is loaded as a list, batched across
+        # records; other pages and filters use the queryset
+        if set(kwargs) != {"first"}:
+            return obj.cts_relations.all()
+        # NOTE: An extra relation is loaded, so `hasNextPage` can be set
+        limit = kwargs["first"] + 1
+        model_fields = get_selected_model_fields(info, TextPart)
+        if model_fields is not None:
+            model_fields = frozenset(model_fields)
+        loader = _cached(
+            info,
+            ("cts_relations_loader", limit, model_fields),
+            lambda: CTSRelationsLoader(limit, model_fields),
+        )
+        return loader.load(obj.pk)
+
 
 class Query(ObjectType):
     text_group = relay.Node.Field(TextGroupNode)
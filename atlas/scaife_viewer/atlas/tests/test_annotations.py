@@ -0,0 +1,47 @@
+import pytest
+
+from scaife_viewer.atlas.models import Node, TextAnnotation
+
+
+VERSION_URN = "urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:"
+
+
+@pytest.mark.django_db
+def test_bulk_resolve_references():
+    version = Node.add_root(kind="version", urn=VERSION_URN)
+    for pos in range(1, 4):
+        version.add_child(kind="line", urn=f"{VERSION_URN}1.{pos}", ref=f"1.{pos}")
+
+    TextAnnotation.objects.bulk_create(
+        [
+            TextAnnotation(
+                idx=0,
+                urn="urn:cite2:scaife-viewer:ta.v1:1",
+                data={"references": [f"{VERSION_URN}1.3", f"{VERSION_URN}1.1"]},
+            ),
+            TextAnnotation(
+                idx=1,
+                urn="urn:cite2:scaife-viewer:ta.v1:2",
+                data={"references": [f"{VERSION_URN}1.2", f"{VERSION_URN}9.9"]},
+            ),
+            TextAnnotation(idx=2, urn="urn:cite2:scaife-viewer:ta.v1:3", data={}),
+        ]
+    )
+
+    created = TextAnnotation.bulk_resolve_references(TextAnnotation.objects.all())
+
+    assert created == 3
+    resolved = {
+        annotation.urn: list(annotation.text_parts.values_list("ref", flat=True))
+        for annotation in TextAnnotation.objects.all()
+    }
+    # resolve_references stores text parts in path order
+    assert resolved == {
+        "urn:cite2:scaife-viewer:ta.v1:1": ["1.1", "1.3"],
+        "urn:cite2:scaife-viewer:ta.v1:2": ["1.2"],
+        "urn:cite2:scaife-viewer:ta.v1:3": [],
+    }
+    for annotation in TextAnnotation.objects.filter(data__has_key="references"):
+        annotation.resolve_references()
+        refs = list(annotation.text_parts.values_list("ref", flat=True))
+        assert refs == resolved[annotation.urn]
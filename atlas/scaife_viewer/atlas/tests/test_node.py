@@ -1,4 +1,8 @@
 from collections import OrderedDict
+from unittest import mock
+
+from django.db import connection
+from django.db.models import Q
 
 import pytest
 
@@ -456,3 +460,94 @@ def test_node_dump_tree_up_to():
             ],
         }
     ]
+
+
+@pytest.mark.django_db
+def test_node_get_descendants():
+    Node.load_bulk(constants.TREE_DATA)
+
+    node = Node.objects.get(urn="urn:11:")
+    assert list(node.get_descendants().values_list("urn", flat=True)) == [
+        "urn:111:",
+        "urn:1111:",
+        "urn:112:",
+        "urn:1121:",
+    ]
+
+
+def test_node_descendants_path_filter_carries():
+    last = Node.alphabet[-1]
+    assert Node._get_descendants_path_filter(f"0001{last}") == (
+        Q(path__gt=f"0001{last}") & Q(path__lt="0002")
+    )
+    assert Node._get_descendants_path_filter(last * 4) == Q(path__gt=last * 4)
+
+
+@pytest.mark.django_db
+def test_node_get_descendants_case_sensitive_paths():
+    # NOTE: Sibling paths that differ only by case (or end in `Z`) aren't
+    # contiguous under case-insensitive collations
+    root = Node.add_root(kind="node", urn="urn:1:")
+    for step in ["B", "Z", "a", "b"]:
+        Node.objects.create(
+            path=f"{root.path}000{step}", depth=2, kind="node", urn=f"urn:1{step}:"
+        )
+    for parent in Node.objects.filter(depth=2):
+        Node.objects.create(
+            path=f"{parent.path}0001", depth=3, kind="node", urn=f"{parent.urn}1"
+        )
+
+    descendants = {
+        node.urn: list(node.get_descendants().values_list("urn", flat=True))
+        for node in Node.objects.filter(depth=2)
+    }
+    assert descendants == {
+        "urn:1B:": ["urn:1B:1"],
+        "urn:1Z:": ["urn:1Z:1"],
+        "urn:1a:": ["urn:1a:1"],
+        "urn:1b:": ["urn:1b:1"],
+    }
+
+
+def test_node_descendants_path_filter_postgresql():
+    with mock.patch.object(connection, "vendor", "postgresql"):
+        assert Node._get_descendants_path_filter("0001") == (
+            Q(path__startswith="0001") & ~Q(path="0001")
+        )
+        lookup = Node._get_descendants_path_filter("0001", include_self=True)
+        assert lookup == Q(path__startswith="0001")
+
+
+@pytest.mark.django_db
+def test_node_label():
+    root = Node.add_root(kind="textgroup", urn="urn:cts:greekLit:tlg0012:")
+    assert root.label == "urn:cts:greekLit:tlg0012:"
+
+    child = root.add_child(
+        kind="work", urn="urn:cts:greekLit:tlg0012.tlg001:", metadata={"label": "Iliad"}
+    )
+    assert Node.objects.get(pk=child.pk).label == "Iliad"
+
+    # the label follows changes to the metadata
+    child.metadata["label"] = "The Iliad"
+    child.save()
+    assert Node.objects.get(pk=child.pk).label == "The Iliad"
+
+    # a null label falls back to the URN
+    child.metadata["label"] = None
+    child.save()
+    assert Node.objects.get(pk=child.pk).label == "urn:cts:greekLit:tlg0012.tlg001:"
+
+
+@pytest.mark.django_db
+def test_node_denormalized_metadata():
+    root = Node.add_root(kind="work", urn="urn:cts:greekLit:tlg0012.tlg001:")
+    child = root.add_child(
+        kind="version",
+        urn="urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:",
+        metadata={"label": "Iliad", "lang": "grc", "kind": "edition"},
+    )
+    child = Node.objects.get(pk=child.pk)
+    assert child.lang == "grc"
+    assert child.version_kind == "edition"
+    assert child.description is None
@@ -0,0 +1,345 @@
+from django.test import RequestFactory
+
+import graphene
+import pytest
+from graphql_relay import to_global_id
+
+from scaife_viewer.atlas.language_utils import normalize_string
+from scaife_viewer.atlas.models import (
+    Dictionary,
+    DictionaryEntry,
+    Metadata,
+    Node,
+    Sense,
+    Token,
+)
+from scaife_viewer.atlas.schema import (
+    DictionaryEntryFilterSet,
+    Query,
+    TextPartsReferenceFilterMixin,
+    build_lemma_pattern,
+    initialize_passage,
+)
+
+
+VERSION_URN = "urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:"
+
+schema = graphene.Schema(query=Query)
+
+
+def execute(query):
+    result = schema.execute(query, context_value=RequestFactory().get("/graphql/"))
+    assert result.errors is None
+    return result.data
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "lemma,count",
+    [("μῆνις", 2), ("μῆνις,", 1), ("ἄειδε θεά", 1), ("ἄειδε", 2), ("θεά", 1)],
+)
+def test_dictionary_entry_lemma_filter(lemma, count):
+    dictionary = Dictionary.objects.create(
+        label="LSJ", urn="urn:cite2:scaife-viewer:dictionaries.v1:lsj"
+    )
+    headwords = ["μῆνις", "μῆνις, ιος, ἡ", "μῆνισμα", "ἄειδε θεά", "ἄειδε", "θεά."]
+    for idx, headword in enumerate(headwords):
+        DictionaryEntry.objects.create(
+            headword=headword,
+            headword_normalized=normalize_string(headword),
+            idx=idx,
+            urn=f"urn:cite2:scaife-viewer:entries.v1:lsj-{idx}",
+            dictionary=dictionary,
+        )
+    queryset = DictionaryEntry.objects.all()
+
+    matches = DictionaryEntryFilterSet().lemma_filter(queryset, "lemma", lemma)
+
+    # matches the headword regex, whether or not the first token is used
+    pattern = build_lemma_pattern(normalize_string(lemma))
+    expected = queryset.filter(headword_normalized__regex=pattern)
+    assert set(matches) == set(expected)
+    assert len(matches) == count
+
+
+@pytest.mark.django_db
+def test_filter_via_matches(django_assert_num_queries):
+    dictionary = Dictionary.objects.create(
+        label="LSJ", urn="urn:cite2:scaife-viewer:dictionaries.v1:lsj"
+    )
+    for idx, headword in enumerate(["ἄειδε", "ἄειδω", "θεά"]):
+        DictionaryEntry.objects.create(
+            headword=headword,
+            idx=idx,
+            urn=f"urn:cite2:scaife-viewer:entries.v1:lsj-{idx}",
+            dictionary=dictionary,
+        )
+    queryset = DictionaryEntry.objects.all()
+    # joins that duplicate entries
+    matches = queryset.filter(dictionary__entries__idx__gte=0, headword__startswith="ἄ")
+
+    # the matches are filtered against as a subquery, in a single query
+    with django_assert_num_queries(1):
+        entries = TextPartsReferenceFilterMixin.filter_via_matches(queryset, matches)
+        assert sorted(entry.headword for entry in entries) == ["ἄειδε", "ἄειδω"]
+
+
+@pytest.mark.django_db
+def test_metadata_records_cts_relations(django_assert_num_queries):
+    version = Node.add_root(kind="version", urn=VERSION_URN)
+    text_parts = [
+        version.add_child(kind="line", urn=f"{VERSION_URN}{pos}", ref=str(pos))
+        for pos in range(1, 21)
+    ]
+    for idx in range(3):
+        record = Metadata.objects.create(
+            urn=f"urn:cite2:scaife-viewer:metadata.v1:{idx}",
+            collection_urn="urn:cite2:scaife-viewer:metadata_collection.v1:1",
+            label=f"label {idx}",
+            depth=2,
+        )
+        # relations are returned in the order they were added
+        record.cts_relations.set(text_parts[idx:] + text_parts[:idx])
+
+    query = """
+    {
+      metadataRecords {
+        edges {
+          node {
+            label
+            ctsRelations(first: 5) {
+              pageInfo {
+                hasNextPage
+              }
+              edges {
+                node {
+                  urn
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+    """
+    # counts and pages the records, then loads the relations of every
+    # record with one query for the through table and one for the nodes
+    with django_assert_num_queries(4) as captured:
+        data = execute(query)
+
+    for idx, edge in enumerate(data["metadataRecords"]["edges"]):
+        cts_relations = edge["node"]["ctsRelations"]
+        assert cts_relations["pageInfo"]["hasNextPage"]
+        assert [e["node"]["urn"] for e in cts_relations["edges"]] == [
+            text_part.urn for text_part in (text_parts[idx:] + text_parts[:idx])[:5]
+        ]
+    # only the selected fields of the nodes are loaded
+    nodes_sql = captured.captured_queries[-1]["sql"]
+    assert "text_content" not in nodes_sql
+    assert "metadata" not in nodes_sql
+
+
+@pytest.mark.django_db
+def test_initialize_passage_heals_per_request():
+    version = Node.add_root(kind="version", urn=VERSION_URN)
+    for pos in range(1, 4):
+        version.add_child(kind="line", urn=f"{VERSION_URN}{pos}", ref=str(pos), rank=1)
+    reference = f"{VERSION_URN}2"
+
+    request = RequestFactory().get("/graphql/")
+    assert initialize_passage(request, reference) == reference
+    assert not hasattr(request, "healed_passage_reference")
+
+    # after a re-ingest, later requests heal against the new text parts
+    Node.objects.get(urn=reference).delete()
+    request = RequestFactory().get("/graphql/")
+    assert initialize_passage(request, reference) == f"{VERSION_URN}1"
+    assert request.healed_passage_reference == f"{VERSION_URN}1"
+
+
+@pytest.mark.django_db
+def test_node_fields_are_batched(django_assert_num_queries):
+    version = Node.add_root(kind="version", urn=VERSION_URN)
+    text_part = version.add_child(kind="line", urn=f"{VERSION_URN}1", ref="1")
+    tokens = [
+        Token.objects.create(
+            text_part=text_part,
+            value=value,
+            word_value=value,
+            position=idx + 1,
+            idx=idx,
+        )
+        for idx, value in enumerate(["μῆνιν", "ἄειδε", "θεὰ"])
+    ]
+    aliases = "\n".join(
+        f'token{idx}: token(id: "{to_global_id("TokenNode", token.pk)}") {{ value }}'
+        for idx, token in enumerate(tokens)
+    )
+
+    # every token is fetched by a single query
+    with django_assert_num_queries(1):
+        data = execute(f"{{ {aliases} }}")
+
+    assert [data[f"token{idx}"]["value"] for idx in range(3)] == [
+        token.value for token in tokens
+    ]
+
+
+@pytest.mark.django_db
+def test_version_labels_are_batched(django_assert_num_queries):
+    namespace = Node.add_root(kind="nid", urn="urn:cts:").add_child(
+        kind="namespace", urn="urn:cts:greekLit:"
+    )
+    for idx in range(3):
+        text_group = namespace.add_child(
+            kind="textgroup",
+            urn=f"urn:cts:greekLit:tlg000{idx}:",
+            metadata={"label": f"text group {idx}"},
+        )
+        work = text_group.add_child(
+            kind="work",
+            urn=f"urn:cts:greekLit:tlg000{idx}.tlg001:",
+            metadata={"label": f"work {idx}"},
+        )
+        work.add_child(
+            kind="version",
+            urn=f"urn:cts:greekLit:tlg000{idx}.tlg001.perseus-grc2:",
+            metadata={"label": f"version {idx}", "lang": "grc"},
+        )
+
+    query = """
+    {
+      versions {
+        edges {
+          node {
+            metadata
+          }
+        }
+      }
+    }
+    """
+    # counts and pages the versions, then loads the labels of every
+    # work and text group with one query
+    with django_assert_num_queries(3):
+        data = execute(query)
+
+    for idx, edge in enumerate(data["versions"]["edges"]):
+        metadata = edge["node"]["metadata"]
+        assert metadata["workLabel"] == f"work {idx}"
+        assert metadata["textGroupLabel"] == f"text group {idx}"
+
+
+@pytest.mark.django_db
+def test_tokens_join_selected_text_part(django_assert_num_queries):
+    version = Node.add_root(kind="version", urn=VERSION_URN)
+    for pos in range(1, 4):
+        text_part = version.add_child(
+            kind="line", urn=f"{VERSION_URN}{pos}", ref=str(pos)
+        )
+        Token.objects.create(
+            text_part=text_part, value="μῆνιν", word_value="μῆνιν", position=1, idx=0
+        )
+
+    query = """
+    {
+      tokens {
+        edges {
+          node {
+            value
+            textPart {
+              urn
+            }
+          }
+        }
+      }
+    }
+    """
+    # counts and pages the tokens, joining their text parts
+    with django_assert_num_queries(2) as captured:
+        data = execute(query)
+
+    assert [e["node"]["textPart"]["urn"] for e in data["tokens"]["edges"]] == [
+        f"{VERSION_URN}{pos}" for pos in range(1, 4)
+    ]
+    # only the selected fields of the tokens are loaded
+    tokens_sql = captured.captured_queries[-1]["sql"]
+    assert "JOIN" in tokens_sql
+    assert "lemma" not in tokens_sql
+
+
+@pytest.mark.django_db
+def test_dictionary_entry_sense_tree(django_assert_num_queries):
+    dictionary = Dictionary.objects.create(
+        label="LSJ", urn="urn:cite2:scaife-viewer:dictionaries.v1:lsj"
+    )
+    for idx in range(2):
+        entry = DictionaryEntry.objects.create(
+            headword=f"headword {idx}",
+            idx=idx,
+            urn=f"urn:cite2:scaife-viewer:entries.v1:lsj-{idx}",
+            dictionary=dictionary,
+        )
+        urn = f"urn:cite2:scaife-viewer:senses.v1:lsj-{idx}"
+        first = Sense.add_root(entry=entry, urn=f"{urn}-1")
+        first.add_child(entry=entry, urn=f"{urn}-1-1").add_child(
+            entry=entry, urn=f"{urn}-1-1-1"
+        )
+        first.add_child(entry=entry, urn=f"{urn}-1-2")
+        Sense.add_root(entry=entry, urn=f"{urn}-2")
+
+    query = """
+    {
+      dictionaryEntries {
+        edges {
+          node {
+            senseTree
+          }
+        }
+      }
+    }
+    """
+    # counts and pages the entries, then loads the senses of each entry
+    # with a single query
+    with django_assert_num_queries(4):
+        data = execute(query)
+
+    for idx, edge in enumerate(data["dictionaryEntries"]["edges"]):
+        urn = f"urn:cite2:scaife-viewer:senses.v1:lsj-{idx}"
+        assert edge["node"]["senseTree"] == [
+            {
+                "id": f"{urn}-1",
+                "children": [
+                    {"id": f"{urn}-1-1", "children": [{"id": f"{urn}-1-1-1"}]},
+                    {"id": f"{urn}-1-2"},
+                ],
+            },
+            {"id": f"{urn}-2"},
+        ]
+
+
+@pytest.mark.django_db
+def test_text_parts_reference_range(django_assert_num_queries):
+    version = Node.add_root(kind="version", urn=VERSION_URN)
+    for idx in range(6):
+        version.add_child(
+            kind="line", urn=f"{VERSION_URN}{idx + 1}", ref=str(idx + 1), idx=idx
+        )
+
+    query = f"""
+    {{
+      textParts(reference: "{VERSION_URN}2-4") {{
+        edges {{
+          node {{
+            urn
+          }}
+        }}
+      }}
+    }}
+    """
+    # resolves the range with one aggregate, then counts and pages it
+    with django_assert_num_queries(3):
+        data = execute(query)
+
+    assert [e["node"]["urn"] for e in data["textParts"]["edges"]] == [
+        f"{VERSION_URN}{ref}" for ref in range(2, 5)
+    ]
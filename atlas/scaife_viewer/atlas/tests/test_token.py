@@ -0,0 +1,272 @@
+import json
+import os
+from unittest import mock
+
+from django.db import connection
+from django.db.models import QuerySet
+
+import pytest
+
+from scaife_viewer.atlas import tokenizers
+from scaife_viewer.atlas.models import (
+    NamedEntity,
+    Node,
+    Token,
+    _copy_text_value,
+)
+from scaife_viewer.atlas.tokenizers import delete_tokens
+
+
+def test_tokenize_subrefs():
+    text_part = Node(
+        urn="urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:1.1",
+        ref="1.1",
+        text_content="ab, a ab b.",
+    )
+    counters = {"token_idx": 0}
+
+    tokens = Token.tokenize(text_part, counters)
+
+    assert [t.value for t in tokens] == ["ab,", "a", "ab", "b."]
+    assert [t.word_value for t in tokens] == ["ab", "a", "ab", "b"]
+    # subrefs count occurrences within the preceding words, too
+    assert [t.subref_value for t in tokens] == ["ab[1]", "a[2]", "ab[2]", "b[3]"]
+    assert [t.position for t in tokens] == [1, 2, 3, 4]
+    assert [t.ve_ref for t in tokens] == ["1.1.t1", "1.1.t2", "1.1.t3", "1.1.t4"]
+    assert [t.idx for t in tokens] == [0, 1, 2, 3]
+    assert counters["token_idx"] == 4
+
+
+@pytest.mark.django_db
+def test_bulk_tokenize():
+    version = Node.add_root(
+        kind="version", urn="urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:"
+    )
+    text_parts = [
+        version.add_child(
+            kind="line",
+            urn=f"{version.urn}1.{pos}",
+            ref=f"1.{pos}",
+            rank=1,
+            text_content=text_content,
+        )
+        for pos, text_content in enumerate(["a b c", "d e", "f"], 1)
+    ]
+    counters = {"token_idx": 0}
+
+    assert Token.bulk_tokenize(text_parts, counters, batch_size=2) == 6
+    assert list(Token.objects.order_by("idx").values_list("idx", "ve_ref")) == [
+        (0, "1.1.t1"),
+        (1, "1.1.t2"),
+        (2, "1.1.t3"),
+        (3, "1.2.t1"),
+        (4, "1.2.t2"),
+        (5, "1.3.t1"),
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_tokenize_rows():
+    version = Node.add_root(
+        kind="version", urn="urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:"
+    )
+    text_part = version.add_child(
+        kind="line", urn=f"{version.urn}1.1", ref="1.1", rank=1, text_content="a b"
+    )
+    rows = Node.objects.filter(pk=text_part.pk).values_list(
+        "pk", "ref", "text_content", named=True
+    )
+
+    assert Token.bulk_tokenize(rows, {"token_idx": 0}) == 2
+    assert list(text_part.tokens.order_by("idx").values_list("ve_ref", flat=True)) == [
+        "1.1.t1",
+        "1.1.t2",
+    ]
+
+
+@pytest.mark.django_db
+def test_token_str_does_not_fetch_text_part(django_assert_num_queries):
+    version = Node.add_root(
+        kind="version", urn="urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:"
+    )
+    text_part = version.add_child(
+        kind="line", urn=f"{version.urn}1.1", ref="1.1", rank=1, text_content="a"
+    )
+    Token.bulk_tokenize([text_part], {"token_idx": 0})
+
+    token = Token.objects.get()
+    with django_assert_num_queries(0):
+        assert str(token) == f"<Token {token.pk}>"
+
+    token = Token.objects.select_related("text_part").get()
+    with django_assert_num_queries(0):
+        assert str(token) == f"{text_part.urn} :: a"
+
+
+@pytest.mark.django_db
+def test_delete_tokens():
+    text_parts = []
+    for version_urn in [
+        "urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:",
+        "urn:cts:greekLit:tlg0012.tlg001.perseus-eng3:",
+    ]:
+        version = Node.add_root(kind="version", urn=version_urn)
+        text_parts.append(
+            version.add_child(
+                kind="line",
+                urn=f"{version_urn}1.1",
+                ref="1.1",
+                rank=1,
+                text_content="a b",
+            )
+        )
+    Token.bulk_tokenize(text_parts, {"token_idx": 0})
+    entity = NamedEntity.objects.create(
+        title="Achilles", kind="person", url="https://example.com", urn="urn:ne:1"
+    )
+    entity.tokens.set(Token.objects.all())
+
+    delete_tokens("urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:")
+
+    assert (
+        list(Token.objects.values_list("text_part__urn", flat=True))
+        == ["urn:cts:greekLit:tlg0012.tlg001.perseus-eng3:1.1"] * 2
+    )
+    assert entity.tokens.count() == 2
+
+
+@pytest.mark.django_db
+def test_delete_tokens_is_atomic():
+    version_urn = "urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:"
+    version = Node.add_root(kind="version", urn=version_urn)
+    text_part = version.add_child(
+        kind="line", urn=f"{version_urn}1.1", ref="1.1", rank=1, text_content="a b"
+    )
+    Token.bulk_tokenize([text_part], {"token_idx": 0})
+    entity = NamedEntity.objects.create(
+        title="Achilles", kind="person", url="https://example.com", urn="urn:ne:1"
+    )
+    entity.tokens.set(Token.objects.all())
+
+    # NOTE: Fails deleting the tokens, after their relations were deleted
+    raw_delete = QuerySet._raw_delete
+
+    def failing_raw_delete(queryset, using):
+        if queryset.model is Token:
+            raise RuntimeError
+        return raw_delete(queryset, using)
+
+    with mock.patch.object(
+        QuerySet, "_raw_delete", autospec=True, side_effect=failing_raw_delete
+    ):
+        with pytest.raises(RuntimeError):
+            delete_tokens(version_urn)
+
+    assert Token.objects.count() == 2
+    assert entity.tokens.count() == 2
+
+
+def create_text_parts(count):
+    version_urn = "urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:"
+    version = Node.add_root(kind="version", urn=version_urn)
+    return [
+        version.add_child(
+            kind="line",
+            urn=f"{version_urn}1.{pos}",
+            ref=f"1.{pos}",
+            rank=1,
+            text_content="a b",
+        )
+        for pos in range(1, count + 1)
+    ]
+
+
+@pytest.mark.django_db
+def test_probe_text_parts_rolls_back_tokens():
+    text_parts = create_text_parts(2)
+
+    with mock.patch.object(
+        Token, "bulk_insert", wraps=Token.bulk_insert
+    ) as bulk_insert:
+        tokenizers._probe_text_parts([text_part.pk for text_part in text_parts])
+
+    assert bulk_insert.call_count == 1
+    assert Token.objects.count() == 0
+
+
+@pytest.mark.django_db
+@mock.patch.object(tokenizers, "AUTOTUNE_PROBES_PER_WORKER", 2)
+@mock.patch.object(tokenizers, "AUTOTUNE_PROBE_SIZE", 2)
+def test_autotune_workers(settings, tmp_path):
+    settings.SV_ATLAS_INGESTION_AUTOTUNE_PATH = str(tmp_path / "autotune.json")
+    pks = [text_part.pk for text_part in create_text_parts(6)]
+    timings = {1: 1.0, 2: 1.0, 4: 4.0}
+
+    with mock.patch.object(
+        tokenizers, "_time_probes", side_effect=lambda probes, n: timings[n]
+    ) as time_probes:
+        workers = tokenizers.autotune_workers(candidates=[1, 2, 4])
+
+    # 4, 6 and 1.5 text parts per second
+    assert workers == 2
+    probes = [call[0][0] for call in time_probes.call_args_list]
+    assert probes == [
+        [pks[:2], pks[2:4]],
+        [pks[:2], pks[2:4], pks[4:]],
+        [pks[:2], pks[2:4], pks[4:]],
+    ]
+
+    # the stored worker count is reused for the same corpus
+    with mock.patch.object(tokenizers, "_time_probes") as time_probes:
+        assert tokenizers.autotune_workers(candidates=[1, 2, 4]) == 2
+    assert not time_probes.called
+
+
+@pytest.mark.parametrize(
+    "stored",
+    [
+        {"cpu_count": os.cpu_count() + 1, "text_part_count": 6, "workers": 2},
+        {"cpu_count": os.cpu_count(), "text_part_count": 7, "workers": 2},
+    ],
+)
+def test_load_autotuned_workers_checks_machine_and_corpus(settings, tmp_path, stored):
+    path = tmp_path / "autotune.json"
+    settings.SV_ATLAS_INGESTION_AUTOTUNE_PATH = str(path)
+    path.write_text(json.dumps(stored))
+
+    assert tokenizers.load_autotuned_workers(6) is None
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, "\\N"),
+        ("a\tb", "a\\tb"),
+        ("a\nb\r", "a\\nb\\r"),
+        ("a\\b", "a\\\\b"),
+        (True, "t"),
+        (False, "f"),
+        (0, "0"),
+        ("μῆνιν", "μῆνιν"),
+    ],
+)
+def test_copy_text_value(value, expected):
+    assert _copy_text_value(value) == expected
+
+
+def test_build_copy_buffer():
+    tokens = [
+        Token(text_part_id=1, value="a\tb", word_value="ab", position=1, idx=0),
+        Token(text_part_id=1, value="c\\", position=2, idx=1, ve_ref="1.1.t2"),
+    ]
+    fields = [
+        Token._meta.get_field(name)
+        for name in ["text_part", "value", "word_value", "position", "idx", "ve_ref"]
+    ]
+
+    buf = Token.build_copy_buffer(tokens, fields, connection)
+
+    assert buf.read().splitlines() == [
+        "1\ta\\tb\tab\t1\t0\t\\N",
+        "1\tc\\\\\t\\N\t2\t1\t1.1.t2",
+    ]
@@ -0,0 +1,172 @@
+from types import SimpleNamespace
+
+import pytest
+from graphene_django.utils import camelize as graphene_camelize
+from graphql import parse
+
+from scaife_viewer.atlas.models import NamedEntity, Node, Token
+from scaife_viewer.atlas.utils import (
+    camelize,
+    get_selected_model_fields,
+    get_selected_related_fields,
+    get_textparts_from_passage_reference,
+)
+
+
+VERSION_URN = "urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:"
+
+
+def test_camelize():
+    data = {
+        "first_passage_urn": "urn:cts:greekLit:tlg0012.tlg001.perseus-grc2:1.1",
+        "citation_scheme": ["book", "line"],
+        "extra": [{"text_group_label": "Homer", "depth_range": (1, 2)}, None],
+        "nested_data": {"inner_key": {"snake_value": "not_camelized"}},
+        1: "non-string key",
+    }
+
+    assert camelize(data) == graphene_camelize(data)
+    assert camelize("snake_case") == "snake_case"
+    assert camelize([{"work_label": "Iliad"}]) == [{"workLabel": "Iliad"}]
+
+
+@pytest.mark.django_db
+def test_get_textparts_from_passage_reference(django_assert_num_queries):
+    parent = Node.add_root(kind="nid", urn="urn:")
+    for kind, urn in [
+        ("namespace", "urn:cts:"),
+        ("textgroup", "urn:cts:greekLit:tlg0012:"),
+        ("work", "urn:cts:greekLit:tlg0012.tlg001:"),
+    ]:
+        parent = parent.add_child(kind=kind, urn=urn)
+    version = parent.add_child(
+        kind="version", urn=VERSION_URN, metadata={"citation_scheme": ["line"]}
+    )
+    for idx in range(5):
+        version.add_child(
+            kind="line", urn=f"{VERSION_URN}{idx + 1}", ref=f"{idx + 1}", idx=idx
+        )
+
+    with django_assert_num_queries(2):
+        textparts = get_textparts_from_passage_reference(
+            f"{VERSION_URN}2-4", version=version
+        )
+        assert list(textparts.values_list("ref", flat=True)) == ["2", "3", "4"]
+
+    with django_assert_num_queries(1):
+        textparts = get_textparts_from_passage_reference(
+            f"{VERSION_URN}9", version=version
+        )
+        assert not textparts.exists()
+
+
+def get_resolve_info(query):
+    """
+    Returns the parts of the `ResolveInfo` for the top-level field of
+    `query` that are read when inspecting its selection
+    """
+    operation, *fragments = parse(query).definitions
+    return SimpleNamespace(
+        field_asts=operation.selection_set.selections,
+        fragments={fragment.name.value: fragment for fragment in fragments},
+    )
+
+
+TOKENS_QUERY = """
+{
+  tokens {
+    edges {
+      node {
+        id
+        token: value
+        ...TokenFields
+        ... on TokenNode {
+          position
+        }
+        textPart {
+          urn
+        }
+        namedEntities {
+          edges {
+            node {
+              title
+            }
+          }
+        }
+      }
+    }
+  }
+}
+fragment TokenFields on TokenNode {
+  wordValue
+}
+"""
+
+
+def test_get_selected_model_fields():
+    info = get_resolve_info(TOKENS_QUERY)
+
+    # aliases and fragments are resolved to fields; reverse relations
+    # (`namedEntities`) only require the pk
+    assert get_selected_model_fields(info, Token) == {
+        "id",
+        "value",
+        "word_value",
+        "position",
+        "text_part",
+    }
+
+
+NAMED_ENTITIES_QUERY = (
+    "{ namedEntities { edges { node { title "
+    "tokens { edges { node { value } } } } } } }"
+)
+
+
+def test_get_selected_model_fields_many_to_many():
+    info = get_resolve_info(NAMED_ENTITIES_QUERY)
+
+    assert get_selected_model_fields(info, NamedEntity) == {"id", "title"}
+
+
+def test_get_selected_model_fields_unknown_field():
+    info = get_resolve_info("{ tokens { edges { node { value computedValue } } } }")
+
+    assert get_selected_model_fields(info, Token) is None
+
+
+def test_get_selected_model_fields_without_edges():
+    info = get_resolve_info(
+        '{ node(id: "VG9rZW5Ob2RlOjE=") { ... on TokenNode { value } } }'
+    )
+
+    assert get_selected_model_fields(info, Token) is None
+
+
+def test_get_selected_related_fields():
+    info = get_resolve_info(TOKENS_QUERY)
+
+    # only forward many-to-one / one-to-one relations can be joined
+    assert get_selected_related_fields(info, Token) == ["text_part"]
+
+
+def test_get_selected_related_fields_many_to_many():
+    info = get_resolve_info(NAMED_ENTITIES_QUERY)
+
+    assert get_selected_related_fields(info, NamedEntity) == []
+
+
+def test_get_selected_related_fields_reverse_relation():
+    info = get_resolve_info(
+        "{ nodes { edges { node { urn tokens { edges { id } } } } } }"
+    )
+
+    assert get_selected_related_fields(info, Node) == []
+
+
+def test_get_selected_related_fields_without_edges():
+    info = get_resolve_info(
+        '{ node(id: "VG9rZW5Ob2RlOjE=") { ... on TokenNode { value } } }'
+    )
+
+    assert get_selected_related_fields(info, Token) == []
@@ -1,46 +1,269 @@
 import concurrent.futures
+import json
+import os
 import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from django.db import connections, transaction
 
 from .conf import settings
-from .models import Node, Token
+from .models import NamedEntity, Node, TextAlignmentRecordRelation, Token
 from .utils import get_lowest_citable_nodes
 
 
-LIMIT = 500
+# The number of text parts tokenized per probe when autotuning, and the
+# number of probes per worker; large enough that per-task overhead and
+# noise don't dominate the timings
+AUTOTUNE_PROBE_SIZE = 25
+AUTOTUNE_PROBES_PER_WORKER = 4
+
+
+def delete_tokens(version_exemplar_urn, version_exemplar=None):
+    """
+    Deletes the tokens for the text parts of `version_exemplar_urn`
+
+    Tokens are selected via the version's descendants (matched on their
+    path prefix) rather than a `LIKE` on text part URNs.
+
+    Tokens are deleted without fetching them (or dispatching signals)
+    for the cascade, so the named entity / alignment record relations
+    to the tokens are deleted first, in the same transaction.
+    """
+    if version_exemplar is None:
+        version_exemplar = Node.objects.filter(urn=version_exemplar_urn).first()
+    if version_exemplar is None:
+        return
+    text_parts = version_exemplar.get_descendants().order_by().values("pk")
+    tokens = Token.objects.filter(text_part__in=text_parts)
+    with transaction.atomic(using=tokens.db):
+        for through_model in [
+            NamedEntity.tokens.through,
+            TextAlignmentRecordRelation.tokens.through,
+        ]:
+            relations = through_model.objects.filter(token__in=tokens)
+            relations._raw_delete(relations.db)
+        tokens._raw_delete(tokens.db)
 
 
 def tokenize_text_parts(version_exemplar_urn, force=True):
+    version_exemplar = Node.objects.get(urn=version_exemplar_urn)
     if force:
-        Token.objects.filter(text_part__urn__icontains=version_exemplar_urn).delete()
+        delete_tokens(version_exemplar_urn, version_exemplar=version_exemplar)
 
-    version_exemplar = Node.objects.get(urn=version_exemplar_urn)
-    text_parts = get_lowest_citable_nodes(version_exemplar)
+    # NOTE: Tokenizing only requires these fields, so text parts are
+    # streamed as rows rather than instantiated as nodes
+    text_parts = (
+        get_lowest_citable_nodes(version_exemplar)
+        .values_list("pk", "ref", "text_content", named=True)
+        .iterator(chunk_size=2000)
+    )
     counters = {"token_idx": 0}
-    to_create = []
-    for text_part in text_parts:
-        to_create.extend(Token.tokenize(text_part, counters))
-    created = len(Token.objects.bulk_create(to_create, batch_size=LIMIT))
+    created = Token.bulk_tokenize(
+        text_parts, counters, batch_size=settings.SV_ATLAS_TOKEN_BATCH_SIZE
+    )
     print(f"Created {created} tokens for {version_exemplar}", file=sys.stderr)
 
 
-def tokenize_all_text_parts_parallel(reset=False):
-    exceptions = False
+def _init_tokenizer_worker():
+    # NOTE: Worker processes can't share the connections inherited from
+    # the parent process, so each opens its own connection once.
+    connections.close_all()
+
+
+def _tokenize_version_exemplar(args):
+    urn, force = args
+    try:
+        tokenize_text_parts(urn, force=force)
+    except Exception as exc:
+        return urn, str(exc)
+    return urn, None
+
+
+def _collect_tokenizer_result(future, urn, failures):
+    try:
+        _, exc = future.result()
+    except Exception as error:
+        # NOTE: Includes `BrokenProcessPool` if the worker died
+        exc = str(error)
+    if exc is not None:
+        failures.append((urn, exc))
+
+
+def _tokenize_in_pool(tasks, processes):
+    """
+    Tokenizes each `(urn, force)` in `tasks`, returning `(urn, exc)`
+    for each failure
+
+    At most two tasks per worker are in flight at a time, so workers stay
+    busy without every task being queued (and pickled) up front.
+    """
+    processes = processes or os.cpu_count() or 1
+    tasks = iter(tasks)
+    failures = []
+    pending = {}
+
+    connections.close_all()
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_tokenizer_worker
+    ) as executor:
+        try:
+            for task in tasks:
+                if len(pending) >= 2 * processes:
+                    done, _ = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        _collect_tokenizer_result(future, pending.pop(future), failures)
+                pending[executor.submit(_tokenize_version_exemplar, task)] = task[0]
+        except BrokenProcessPool as exc:
+            # NOTE: A worker died (e.g. it was OOM-killed); the pool can't
+            # accept more tasks, so the rest are reported as failures
+            failures.extend((urn, str(exc)) for urn, _ in [task, *tasks])
+        for future in concurrent.futures.as_completed(pending):
+            _collect_tokenizer_result(future, pending[future], failures)
+    return failures
+
+
+def _probe_text_parts(pks):
+    """
+    Tokenizes the text parts in `pks`, rolling back the tokens
+    """
+    queryset = Node.objects.filter(pk__in=pks)
+    # NOTE: Text parts are read before the transaction begins, so it only
+    # writes; on SQLite, upgrading a read transaction to a write fails
+    # immediately (rather than waiting) while another worker is writing
+    text_parts = list(queryset.values_list("pk", "ref", "text_content", named=True))
+    with transaction.atomic(using=queryset.db):
+        Token.bulk_tokenize(
+            text_parts, {"token_idx": 0}, batch_size=settings.SV_ATLAS_TOKEN_BATCH_SIZE
+        )
+        transaction.set_rollback(True, using=queryset.db)
+
+
+def _warm_up_tokenizer_worker():
+    Node.objects.exists()
+
+
+def _time_probes(probes, processes):
+    """
+    Returns the seconds taken to tokenize `probes` with `processes`
+    workers
+
+    The workers are started (and connected to the database) before the
+    probes are timed, so the timings don't include pool startup.
+    """
+    connections.close_all()
     with concurrent.futures.ProcessPoolExecutor(
-        max_workers=settings.SV_ATLAS_INGESTION_CONCURRENCY
+        max_workers=processes, initializer=_init_tokenizer_worker
     ) as executor:
-        version_exemplar_nodes = Node.objects.filter(kind__in=["version", "exemplar"])
-        urn_futures = {
-            executor.submit(tokenize_text_parts, node.urn, force=reset): node.urn
-            for node in version_exemplar_nodes
-        }
-        for f in concurrent.futures.as_completed(urn_futures):
-            urn = urn_futures[f]
-            try:
-                f.result()
-            except Exception as exc:
-                exceptions = True
-                print("{} generated an exception: {}".format(urn, exc))
-    if exceptions:
+        warm_ups = [
+            executor.submit(_warm_up_tokenizer_worker) for _ in range(processes)
+        ]
+        concurrent.futures.wait(warm_ups)
+        start = time.perf_counter()
+        list(executor.map(_probe_text_parts, probes))
+        return time.perf_counter() - start
+
+
+def load_autotuned_workers(text_part_count):
+    """
+    Returns the worker count stored at `SV_ATLAS_INGESTION_AUTOTUNE_PATH`,
+    if it was tuned on a machine with the same number of processors for
+    a corpus of the same size
+    """
+    path = settings.SV_ATLAS_INGESTION_AUTOTUNE_PATH
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    if data.get("cpu_count") != os.cpu_count():
+        return None
+    if data.get("text_part_count") != text_part_count:
+        return None
+    return data.get("workers")
+
+
+def save_autotuned_workers(text_part_count, workers):
+    path = settings.SV_ATLAS_INGESTION_AUTOTUNE_PATH
+    if not path:
+        return
+    data = {
+        "cpu_count": os.cpu_count(),
+        "text_part_count": text_part_count,
+        "workers": workers,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def autotune_workers(candidates=None):
+    """
+    Returns the number of worker processes with the highest tokenizer
+    throughput, storing the result
+
+    Throughput levels off (or drops) past some number of workers, due to
+    IPC, memory and database contention. Each of `candidates` is timed
+    tokenizing `AUTOTUNE_PROBES_PER_WORKER` probes of
+    `AUTOTUNE_PROBE_SIZE` text parts per worker; the tokens are rolled
+    back, so the sample is left as it was.
+    """
+    text_parts = Node.objects.filter(text_content__isnull=False)
+    text_part_count = text_parts.count()
+    workers = load_autotuned_workers(text_part_count)
+    if workers is not None:
+        return workers
+
+    cpu_count = os.cpu_count() or 1
+    if candidates is None:
+        candidates = sorted({1, max(cpu_count // 2, 1), cpu_count, 2 * cpu_count})
+    per_worker = AUTOTUNE_PROBE_SIZE * AUTOTUNE_PROBES_PER_WORKER
+    pks = list(
+        text_parts.order_by("pk").values_list("pk", flat=True)[
+            : per_worker * max(candidates)
+        ]
+    )
+    throughputs = {}
+    for candidate in candidates:
+        sample = pks[: per_worker * candidate]
+        probes = [
+            sample[i : i + AUTOTUNE_PROBE_SIZE]
+            for i in range(0, len(sample), AUTOTUNE_PROBE_SIZE)
+        ]
+        elapsed = _time_probes(probes, candidate)
+        throughputs[candidate] = len(sample) / elapsed
+        print(
+            f"Tokenized {len(sample)} text parts with {candidate} workers in {elapsed:.2f}s",
+            file=sys.stderr,
+        )
+    workers = max(throughputs, key=throughputs.get)
+    save_autotuned_workers(text_part_count, workers)
+    return workers
+
+
+def tokenize_all_text_parts_parallel(reset=False):
+    version_exemplar_urns = list(
+        Node.objects.filter(kind__in=["version", "exemplar"]).values_list(
+            "urn", flat=True
+        )
+    )
+
+    processes = settings.SV_ATLAS_INGESTION_CONCURRENCY
+    if processes == "auto":
+        processes = autotune_workers()
+
+    tasks = ((urn, reset) for urn in version_exemplar_urns)
+    failures = _tokenize_in_pool(tasks, processes)
+    for urn, exc in failures:
+        print("{} generated an exception: {}".format(urn, exc))
+    if failures:
         raise AssertionError("Exceptions were encountered tokenizing textparts")
 
 
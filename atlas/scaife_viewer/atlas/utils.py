@@ -1,8 +1,12 @@
+from functools import lru_cache
 from itertools import islice
 
+from django.core.exceptions import FieldDoesNotExist
 from django.db.models import Max, Min, Q
 from django.utils.functional import cached_property
 
+from graphene.utils.str_converters import to_camel_case, to_snake_case
+from graphql.language import ast
 from tqdm import tqdm
 
 from scaife_viewer.atlas.conf import settings
@@ -145,18 +149,13 @@ def filter_via_ref_predicate(queryset, predicate):
     # else we can do with siblings / slicing within treebeard. Using `path`
     # might work too, but having `idx` also allows us to do simple integer math
     # as-needed.
-    if queryset.exists():
-        try:
-            subquery = queryset.filter(predicate).aggregate(
-                min=Min("idx"), max=Max("idx")
-            )
-            queryset = queryset.filter(
-                idx__gte=subquery["min"], idx__lte=subquery["max"]
-            )
-        except Exception:
-            # TODO: Handle SV 1 where not all text parts are ingested
-            return queryset.none()
-    return queryset
+    # NOTE: An empty queryset (or predicate) aggregates to `None`, so
+    # this doesn't need to check `queryset.exists()` first
+    bounds = queryset.filter(predicate).aggregate(min=Min("idx"), max=Max("idx"))
+    if bounds["min"] is None or bounds["max"] is None:
+        # TODO: Handle SV 1 where not all text parts are ingested
+        return queryset.none()
+    return queryset.filter(idx__gte=bounds["min"], idx__lte=bounds["max"])
 
 
 def get_lowest_citable_depth(citation_scheme):
@@ -206,3 +205,147 @@ def chunked_bulk_create(model, iterable, total=None, batch_size=500):
                 break
             created = len(model.objects.bulk_create(subset, batch_size=batch_size))
             pbar.update(created)
+
+
+@lru_cache(maxsize=4096)
+def _camelize_key(key):
+    return to_camel_case(key)
+
+
+_CONTAINER_TYPES = (dict, list, tuple)
+
+
+def _new_container(value, push):
+    """
+    Returns an empty container to camelize `value` into, pushing the pair
+    onto the stack via `push`; scalar values are returned as-is.
+    """
+    if isinstance(value, dict):
+        container = {}
+    elif isinstance(value, (list, tuple)):
+        container = []
+    else:
+        return value
+    push((value, container))
+    return container
+
+
+def _camelize_dict(source, target, push):
+    for key, value in source.items():
+        if isinstance(key, str):
+            key = _camelize_key(key)
+        if isinstance(value, _CONTAINER_TYPES):
+            value = _new_container(value, push)
+        target[key] = value
+
+
+def _camelize_list(source, target, push):
+    append = target.append
+    for value in source:
+        if isinstance(value, _CONTAINER_TYPES):
+            value = _new_container(value, push)
+        append(value)
+
+
+def camelize(data):
+    """
+    A variant of `graphene_django.utils.camelize` for JSON data
+
+    Keys are largely shared across rows, so conversions are cached
+    rather than re-running the camel case regex for every key; nested
+    containers are walked with a stack rather than by recursion, and
+    scalar values are copied as-is.
+    """
+    stack = []
+    pop, push = stack.pop, stack.append
+    result = _new_container(data, push)
+    while stack:
+        source, target = pop()
+        if type(target) is dict:
+            _camelize_dict(source, target, push)
+        else:
+            _camelize_list(source, target, push)
+    return result
+
+
+def _iter_selected_fields(selection_set, fragments):
+    for selection in selection_set.selections:
+        if isinstance(selection, ast.Field):
+            yield selection
+        elif isinstance(selection, ast.FragmentSpread):
+            fragment = fragments[selection.name.value]
+            yield from _iter_selected_fields(fragment.selection_set, fragments)
+        else:
+            yield from _iter_selected_fields(selection.selection_set, fragments)
+
+
+def get_selected_node_fields(info):
+    """
+    Returns the names of the fields selected via `edges { node { ... } }`
+    for the connection being resolved, or `None` if the selection
+    doesn't include any edges.
+    """
+    node_fields = None
+    for field_ast in info.field_asts:
+        if field_ast.selection_set is None:
+            continue
+        for edges in _iter_selected_fields(field_ast.selection_set, info.fragments):
+            if edges.name.value != "edges" or edges.selection_set is None:
+                continue
+            for node in _iter_selected_fields(edges.selection_set, info.fragments):
+                if node.name.value != "node" or node.selection_set is None:
+                    continue
+                if node_fields is None:
+                    node_fields = set()
+                node_fields.update(
+                    field.name.value
+                    for field in _iter_selected_fields(
+                        node.selection_set, info.fragments
+                    )
+                )
+    return node_fields
+
+
+def get_selected_model_fields(info, model):
+    """
+    Returns the names of the concrete fields of `model` backing the
+    fields selected via `edges { node { ... } }`, for use with `only()`
+
+    Returns `None` if the fields can't be determined, or if the selection
+    includes fields that aren't backed by `model`.
+    """
+    node_fields = get_selected_node_fields(info)
+    if node_fields is None:
+        return None
+    model_fields = {model._meta.pk.name}
+    for name in node_fields:
+        if name in {"id", "__typename"}:
+            continue
+        try:
+            field = model._meta.get_field(to_snake_case(name))
+        except FieldDoesNotExist:
+            return None
+        # NOTE: Many-to-many and reverse relations only require the pk
+        if field.concrete and not field.many_to_many:
+            model_fields.add(field.name)
+    return model_fields
+
+
+def get_selected_related_fields(info, model):
+    """
+    Returns the names of the forward many-to-one and one-to-one relations
+    of `model` selected via `edges { node { ... } }`, for use with
+    `select_related()`
+    """
+    node_fields = get_selected_node_fields(info)
+    if node_fields is None:
+        return []
+    related_fields = set()
+    for name in node_fields:
+        try:
+            field = model._meta.get_field(to_snake_case(name))
+        except FieldDoesNotExist:
+            continue
+        if field.concrete and (field.many_to_one or field.one_to_one):
+            related_fields.add(field.name)
+    return sorted(related_fields)
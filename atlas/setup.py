@@ -41,6 +41,8 @@ setup(
         "importlib-resources>=5.1.2,<6",
         "jsonlines>=2.0.0,<3",
         "logfmt==0.4",
+        "promise>=2.3,<3",
+        "PyGithub>=1.56",
         "regex>=2020.11.13",
         "tqdm>= 4.48.2,<5",
     ],
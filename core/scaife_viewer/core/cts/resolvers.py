@@ -122,7 +122,8 @@ class LocalResolver(CtsCapitainsLocalResolver):
     def extract_sv_metadata(self, folder):
         metadata_path = os.path.join(folder, ".scaife-viewer.json")
         try:
-            return json.load(open(metadata_path))
+            with open(metadata_path) as f:
+                return json.load(f)
         except FileNotFoundError:
             return {}
 
@@ -233,4 +234,9 @@ class LocalResolver(CtsCapitainsLocalResolver):
         corpus_metadata_path = os.path.join(
             settings.CTS_LOCAL_DATA_PATH, ".scaife-viewer.json"
         )
-        json.dump(data, open(corpus_metadata_path, "w"), indent=2)
+        # write to a sibling file and swap it into place so readers never
+        # see a partially-written manifest
+        tmp_path = f"{corpus_metadata_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, corpus_metadata_path)